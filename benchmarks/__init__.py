@@ -0,0 +1 @@
+"""Benchmarks for the Ripple energy integration."""
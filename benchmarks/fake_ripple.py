@@ -0,0 +1,148 @@
+"""Local stand-in for the Ripple Energy member data API."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+import hashlib
+from itertools import cycle
+import json
+import random
+from typing import Any
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+API_TOKEN = "benchmark-token"
+ASSET_NAMES = ["Graig Fatha", "Kirk Hill", "Derril Water", "Whitelaw Brae"]
+TIME_SCALES = (
+    "today",
+    "yesterday",
+    "this_week",
+    "last_week",
+    "this_month",
+    "last_month",
+    "this_year",
+    "last_year",
+    "total",
+)
+# Payloads are rendered up front so serving them costs the benchmark little
+PAYLOAD_VARIANTS = 8
+
+
+def asset_name(index: int) -> str:
+    """Return the name of the generation asset at an index."""
+    if index < len(ASSET_NAMES):
+        return ASSET_NAMES[index]
+    return f"Wind Farm {index}"
+
+
+def generation_asset(index: int, rng: random.Random) -> dict[str, Any]:
+    """Return a generation asset shaped like the ones Ripple returns."""
+    capacity = rng.randint(500, 5000)
+    return {
+        "name": asset_name(index),
+        "type": "wind",
+        "status": rng.choice(["Operational", "Operational", "Maintenance"]),
+        "member_capacity": capacity,
+        "member_capacity_units": "W",
+        "member_expected_annual_generation": round(capacity * 2.9 / 1000, 3),
+        "member_expected_annual_generation_units": "MWh",
+        "generation": {
+            "generation_unit": "kWh",
+            "latest_telemetry": {
+                "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "wind_speed_avg": round(rng.uniform(0, 30), 2),
+                "generator_speed_avg": round(rng.uniform(0, 1500), 1),
+                "blade_angle_avg": round(rng.uniform(-2, 90), 2),
+                "nacelle_position": round(rng.uniform(0, 360), 1),
+                "tower_base_temp_avg": round(rng.uniform(-5, 30), 1),
+                "ambient_temp_max": round(rng.uniform(-5, 30), 1),
+            },
+            "latest": {
+                "generation": round(rng.uniform(0, capacity / 1000), 3),
+                "estimated_savings": round(rng.uniform(0, 1), 2),
+            },
+            **{
+                time_scale: {
+                    "generated": round(rng.uniform(0, 10000), 3),
+                    "earned": round(rng.uniform(0, 2000), 2),
+                }
+                for time_scale in TIME_SCALES
+            },
+        },
+    }
+
+
+class FakeRippleServer:
+    """Serve realistic member data with configurable latency and failures."""
+
+    def __init__(
+        self,
+        asset_count: int = 4,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        variants: int = PAYLOAD_VARIANTS,
+        etags: bool = False,
+    ) -> None:
+        """Initialise the fake server."""
+        self.asset_count = asset_count
+        self.latency = latency
+        self.error_rate = error_rate
+        self.etags = etags
+        self.requests = 0
+        self.not_modified = 0
+        self._rng = random.Random(seed)
+        self._server: TestServer | None = None
+        bodies = [json.dumps(self.member_data()) for _ in range(variants)]
+        self._bodies = cycle(
+            (body, f'"{hashlib.sha1(body.encode()).hexdigest()}"') for body in bodies
+        )
+
+        app = web.Application()
+        app.router.add_get("/rest/member_data/{token}", self._handle_member_data)
+        self._app = app
+
+    @property
+    def url(self) -> str:
+        """Return the member data URL to append an API token to."""
+        assert self._server is not None
+        return str(self._server.make_url("/rest/member_data/"))
+
+    def member_data(self) -> dict[str, Any]:
+        """Return a full account payload."""
+        return {
+            "email": "member@example.com",
+            "generation_assets": [
+                generation_asset(index, self._rng) for index in range(self.asset_count)
+            ],
+        }
+
+    async def start(self) -> None:
+        """Start serving on a free local port."""
+        self._server = TestServer(self._app)
+        await self._server.start_server()
+
+    async def close(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            await self._server.close()
+
+    async def _handle_member_data(self, request: web.Request) -> web.Response:
+        """Return member data for the benchmark token."""
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._rng.random() < self.error_rate:
+            return web.Response(status=503)
+        if request.match_info["token"] != API_TOKEN:
+            return web.json_response({"error": "Not authenticated"})
+        body, etag = next(self._bodies)
+        if not self.etags:
+            return web.Response(text=body, content_type="application/json")
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return web.Response(status=304)
+        return web.Response(
+            text=body, content_type="application/json", headers={"ETag": etag}
+        )
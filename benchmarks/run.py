@@ -0,0 +1,250 @@
+"""Benchmark the Ripple energy integration against a local Ripple API stand-in.
+
+Run from the repository root with the Home Assistant test helpers installed::
+
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/run.py --assets 1 10 100 --output bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import ExitStack
+import json
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from homeassistant import loader  # noqa: E402
+from homeassistant.components import recorder  # noqa: E402
+from homeassistant.config_entries import ConfigEntryState  # noqa: E402
+from homeassistant.const import CONF_API_TOKEN, CONF_SCAN_INTERVAL  # noqa: E402
+from homeassistant.helpers import recorder as recorder_helper  # noqa: E402
+from homeassistant.helpers.entity import Entity  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+
+from benchmarks.fake_ripple import API_TOKEN, FakeRippleServer  # noqa: E402
+from custom_components.ripple_energy import api as ripple_api  # noqa: E402
+from custom_components.ripple_energy.const import DOMAIN  # noqa: E402
+
+MAX_SETUP_ATTEMPTS = 50
+
+
+class StateWriteCounter:
+    """Count entity state writes while installed."""
+
+    def __init__(self) -> None:
+        """Initialise the counter."""
+        self.count = 0
+
+    def patch(self) -> Any:
+        """Return a patch that counts calls to async_write_ha_state."""
+        write_ha_state = Entity.async_write_ha_state
+
+        def counting_write_ha_state(entity: Entity) -> None:
+            self.count += 1
+            write_ha_state(entity)
+
+        return patch.object(Entity, "async_write_ha_state", counting_write_ha_state)
+
+
+def patch_ripple(server: FakeRippleServer) -> ExitStack:
+    """Point the integration at the fake server."""
+    stack = ExitStack()
+    stack.enter_context(patch.object(ripple_api, "API_URL", server.url))
+    return stack
+
+
+async def async_setup_hass_dependencies(hass: Any) -> None:
+    """Allow custom integrations and start an in-memory recorder."""
+    hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+    with patch.object(recorder, "ALLOW_IN_MEMORY_DB", True):
+        recorder_helper.async_initialize_recorder(hass)
+        assert await async_setup_component(
+            hass,
+            recorder.DOMAIN,
+            {recorder.DOMAIN: {recorder.CONF_DB_URL: "sqlite://"}},
+        )
+
+
+async def async_setup_entry_until_loaded(hass: Any, entry: MockConfigEntry) -> int:
+    """Set up the entry, retrying straight away while the fake server errors."""
+    attempts = 1
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    while entry.state is not ConfigEntryState.LOADED:
+        if attempts == MAX_SETUP_ATTEMPTS:
+            raise RuntimeError(f"Entry not loaded after {attempts} attempts")
+        attempts += 1
+        await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+    return attempts
+
+
+async def async_run_scenario(
+    asset_count: int, args: argparse.Namespace
+) -> dict[str, Any]:
+    """Set up one config entry against the fake server and measure it."""
+    refreshes = args.refreshes
+    server = FakeRippleServer(
+        asset_count,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        variants=args.payload_variants,
+        etags=args.etags,
+    )
+    await server.start()
+    counter = StateWriteCounter()
+
+    with tempfile.TemporaryDirectory() as storage_dir, patch_ripple(
+        server
+    ), counter.patch():
+        async with async_test_home_assistant(storage_dir=storage_dir) as hass:
+            await async_setup_hass_dependencies(hass)
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                title="member@example.com",
+                data={CONF_API_TOKEN: API_TOKEN},
+                options={CONF_SCAN_INTERVAL: 3600},
+            )
+            entry.add_to_hass(hass)
+
+            start = time.perf_counter()
+            setup_attempts = await async_setup_entry_until_loaded(hass, entry)
+            setup_time = time.perf_counter() - start
+            setup_requests = server.requests
+
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            entities = len(hass.states.async_all())
+            writes_after_setup = counter.count
+
+            refresh_cpu = []
+            failures = 0
+            for _ in range(refreshes):
+                start = time.process_time()
+                await coordinator.async_refresh()
+                refresh_cpu.append(time.process_time() - start)
+                failures += not coordinator.last_update_success
+            await hass.async_block_till_done()
+
+            await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+            await hass.async_stop(force=True)
+
+    await server.close()
+    return {
+        "assets": asset_count,
+        "entities": entities,
+        "setup_seconds": setup_time,
+        "setup_attempts": setup_attempts,
+        "setup_requests": setup_requests,
+        "not_modified_responses": server.not_modified,
+        "refreshes": refreshes,
+        "failed_refreshes": failures,
+        "refresh_cpu_seconds_mean": statistics.fmean(refresh_cpu),
+        "refresh_cpu_seconds_max": max(refresh_cpu),
+        "state_writes_setup": writes_after_setup,
+        "state_writes_per_refresh": (counter.count - writes_after_setup) / refreshes,
+    }
+
+
+async def async_measure_memory(asset_count: int) -> int:
+    """Return the bytes allocated setting up a config entry."""
+    server = FakeRippleServer(asset_count)
+    await server.start()
+
+    with tempfile.TemporaryDirectory() as storage_dir, patch_ripple(server):
+        async with async_test_home_assistant(storage_dir=storage_dir) as hass:
+            await async_setup_hass_dependencies(hass)
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                title="member@example.com",
+                data={CONF_API_TOKEN: API_TOKEN},
+                options={CONF_SCAN_INTERVAL: 3600},
+            )
+            entry.add_to_hass(hass)
+
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            await async_setup_entry_until_loaded(hass, entry)
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+            await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+            await hass.async_stop(force=True)
+
+    await server.close()
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+async def async_main(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every scenario and return the results."""
+    results: dict[str, Any] = {"scenarios": [], "memory": []}
+    for asset_count in args.assets:
+        results["scenarios"].append(await async_run_scenario(asset_count, args))
+
+    # An account needs at least one asset to set up, so the fixed cost of an
+    # entry is taken from a single asset one. The scenarios have imported
+    # the platforms by now so it doesn't include them either.
+    baseline = await async_measure_memory(1)
+    for asset_count in args.assets:
+        allocated = (
+            baseline if asset_count == 1 else await async_measure_memory(asset_count)
+        )
+        results["memory"].append(
+            {
+                "assets": asset_count,
+                "memory_bytes": allocated,
+                # What each asset beyond the first adds, None with nothing
+                # to compare a single asset against
+                "memory_bytes_per_asset": (
+                    None
+                    if asset_count == 1
+                    else (allocated - baseline) / (asset_count - 1)
+                ),
+            }
+        )
+    return results
+
+
+def main() -> None:
+    """Parse arguments, run the benchmarks and write the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--refreshes", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--payload-variants",
+        type=int,
+        default=8,
+        help="distinct payloads to cycle through, 1 serves the same one every time",
+    )
+    parser.add_argument(
+        "--etags", action="store_true", help="send ETags and answer 304 when they match"
+    )
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = asyncio.run(async_main(args))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 """The Ripple energy integration."""
 from __future__ import annotations
 
-import asyncio
 import logging
 
 from pyrippleapi.api import RippleAPI
@@ -10,79 +9,184 @@ from pyrippleapi.exceptions import (
     RippleAuthenticationError,
     RippleDevicesError,
 )
-from pyrippleapi.generation_asset import GenerationAsset
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     CONF_API_TOKEN,
     CONF_SCAN_INTERVAL,
-    CONF_EMAIL,
     Platform,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from .const import DOMAIN, ASSETS
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
+
+from . import websocket_api
+from .api import RippleClient, async_pop_validated_payload
+from .const import (
+    DOMAIN,
+    CONF_EXPORT_DESTINATION,
+    CONF_EXPORT_FORMAT,
+    CONF_IGNORED_ASSETS,
+    CONF_MAX_STALE_AGE,
+    CONF_MEMBER_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_ROLLUP_SCAN_INTERVAL,
+    EXPORT_NONE,
+    MAX_STALE_AGE,
+    MEMBER_POLLING_INTERVAL,
+    MIN_POLLING_INTERVAL,
+    POLLING_INTERVAL,
+    ROLLUP_POLLING_INTERVAL,
+    STORAGE_VERSION,
+    TIER_MEMBER,
+    TIER_ROLLUPS,
+)
 from .coordinator import RippleCoordinator
+from .history import RippleHistory
 
 PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 _LOGGER = logging.getLogger(__name__)
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Ripple energy websocket API."""
+    websocket_api.async_setup(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Owlet Smart Sock from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    ripple_api = RippleAPI(
-        auth_token=entry.data[CONF_API_TOKEN], session=async_get_clientsession(hass)
+    session = async_get_clientsession(hass)
+    ripple_api = RippleAPI(auth_token=entry.data[CONF_API_TOKEN], session=session)
+    client = RippleClient(hass, session, entry.data[CONF_API_TOKEN])
+
+    store = _async_get_snapshot_store(hass, entry)
+    # A config flow that has just validated the token has also just fetched
+    # the payload, take it over along with the client that fetched it
+    if handoff := async_pop_validated_payload(hass, entry.data[CONF_API_TOKEN]):
+        client, payload = handoff
+        snapshot = None
+    # A snapshot is only served for as long as stale data would be served
+    # while Ripple is failing, older figures would be shown as current
+    elif (snapshot := await store.async_load()) is not None and (
+        dt_util.utcnow() - dt_util.parse_datetime(snapshot["timestamp"])
+    ).total_seconds() <= entry.options.get(CONF_MAX_STALE_AGE, MAX_STALE_AGE):
+        payload = snapshot["payload"]
+    else:
+        snapshot = None
+        try:
+            payload = await client.async_get_member_data()
+
+        except RippleAuthenticationError as err:
+            _LOGGER.error("API Key not valid, setup ripple energy again")
+            raise ConfigEntryAuthFailed(
+                f"Credentials expired for {entry.title}"
+            ) from err
+
+        except RippleConnectionError as err:
+            raise ConfigEntryNotReady("Error connecting to ripple") from err
+
+        except RippleDevicesError:
+            _LOGGER.error("No ripple devices found to set up")
+            return False
+
+    coordinator = RippleCoordinator(
+        hass, ripple_api, client, *_poll_intervals(entry), store
     )
-
-    try:
-        assets = await ripple_api.request(assets=ASSETS)
-
-    except RippleAuthenticationError as err:
-        _LOGGER.error("API Key not valid, setup ripple energy again")
-        raise ConfigEntryAuthFailed(
-            f"Credentials expired for {entry.data[CONF_EMAIL]}"
-        ) from err
-
-    except RippleConnectionError as err:
-        raise ConfigEntryNotReady("Error connecting to ripple") from err
-
-    except RippleDevicesError:
-        _LOGGER.error("No ripple devices found to set up")
-        return False
-
-    assets = {
-        asset["name"]: GenerationAsset(ripple_api, asset, assets["email"])
-        for asset in assets["generation_assets"]
-    }
-
-    scan_interval = entry.options.get(CONF_SCAN_INTERVAL)
-    coordinators = {
-        name: RippleCoordinator(hass, asset, scan_interval)
-        for (name, asset) in assets.items()
-    }
-
-    await asyncio.gather(
-        *(
-            coordinator.async_config_entry_first_refresh()
-            for coordinator in list(coordinators.values())
+    await coordinator.history.async_load()
+    await coordinator.async_set_export(*_export_options(entry))
+
+    if snapshot is None:
+        # The client has already seen this payload, a first refresh would
+        # only find it unchanged
+        coordinator.async_set_updated_data(
+            await coordinator.async_process_payload(payload)
+        )
+    else:
+        # Serve the stored snapshot straight away and let the live refresh
+        # catch up without holding up platform setup
+        coordinator.last_fresh = dt_util.parse_datetime(snapshot["timestamp"])
+        coordinator.async_set_updated_data(
+            await coordinator.async_apply_payload(payload)
+        )
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} {entry.title} refresh"
         )
-    )
 
-    hass.data[DOMAIN][entry.entry_id] = coordinators
+    entry.async_on_unload(coordinator.async_schedule_boundary_refresh())
+    hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reschedule the coordinator in place when the options change."""
+    coordinator: RippleCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.async_set_intervals(*_poll_intervals(entry))
+    await coordinator.async_set_export(*_export_options(entry))
+
+    ignored_assets = set(entry.options.get(CONF_IGNORED_ASSETS, []))
+    if ignored_assets != coordinator.ignored_assets:
+        # Reapplying the last payload adds and removes assets without a fetch
+        coordinator.ignored_assets = ignored_assets
+        coordinator.async_set_updated_data(
+            await coordinator.async_apply_payload(coordinator.payload)
+        )
+
+
+def _poll_intervals(
+    entry: ConfigEntry,
+) -> tuple[float, float, dict[str, float]]:
+    """Return the minimum, maximum and tier polling intervals from the options."""
+    return (
+        entry.options.get(CONF_MIN_SCAN_INTERVAL, MIN_POLLING_INTERVAL),
+        entry.options.get(CONF_SCAN_INTERVAL, POLLING_INTERVAL),
+        {
+            TIER_ROLLUPS: entry.options.get(
+                CONF_ROLLUP_SCAN_INTERVAL, ROLLUP_POLLING_INTERVAL
+            ),
+            TIER_MEMBER: entry.options.get(
+                CONF_MEMBER_SCAN_INTERVAL, MEMBER_POLLING_INTERVAL
+            ),
+        },
+    )
+
+
+def _export_options(entry: ConfigEntry) -> tuple[str, str]:
+    """Return the export format and destination from the options."""
+    return (
+        entry.options.get(CONF_EXPORT_FORMAT, EXPORT_NONE),
+        entry.options.get(CONF_EXPORT_DESTINATION, ""),
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot and history when a config entry is removed."""
+    await _async_get_snapshot_store(hass, entry).async_remove()
+    await RippleHistory(hass, entry).async_remove()
+
+
+def _async_get_snapshot_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store holding the last good payload for a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
@@ -0,0 +1,347 @@
+"""Requests to the Ripple energy API shared between config entries."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import hashlib
+from http import HTTPStatus
+import time
+from typing import Any, TypeVar
+
+from aiohttp import ClientError, ClientSession, ClientTimeout, hdrs
+from pyrippleapi.exceptions import (
+    RippleAuthenticationError,
+    RippleConnectionError,
+    RippleDevicesError,
+    RippleError,
+)
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.json import json_loads_object
+
+from .const import (
+    API_HOST,
+    API_URL,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    DATA_REQUEST_SCHEDULER,
+    DATA_VALIDATED_PAYLOADS,
+    DECODE_EXECUTOR_THRESHOLD,
+    MAX_CONCURRENT_REQUESTS,
+    REQUEST_SPACING,
+    REQUEST_TIMEOUT,
+    VALIDATED_PAYLOAD_MAX_AGE,
+)
+
+_T = TypeVar("_T")
+
+# The same headers pyrippleapi sends, Ripple expects a browser
+REQUEST_HEADERS = {
+    hdrs.ACCEPT: "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+    hdrs.ACCEPT_ENCODING: "gzip, deflate, br",
+    hdrs.ACCEPT_LANGUAGE: "en-GB,en;q=0.9,en-US;q=0.8",
+    hdrs.USER_AGENT: "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36 Edg/114.0.1823.67",
+}
+
+# The parts of the account payload GenerationAsset reads, anything else
+# Ripple sends is dropped before the payload reaches the event loop
+ACCOUNT_KEYS = ("email", "generation_assets")
+ASSET_KEYS = (
+    "name",
+    "type",
+    "status",
+    "member_capacity",
+    "member_capacity_units",
+    "member_expected_annual_generation",
+    "member_expected_annual_generation_units",
+    "generation",
+)
+GENERATION_KEYS = (
+    "generation_unit",
+    "latest_telemetry",
+    "latest",
+    "today",
+    "yesterday",
+    "this_week",
+    "last_week",
+    "this_month",
+    "last_month",
+    "this_year",
+    "last_year",
+    "total",
+)
+
+
+class RippleClient:
+    """Fetch member data from Ripple, skipping the work when it hasn't changed."""
+
+    def __init__(
+        self, hass: HomeAssistant, session: ClientSession, auth_token: str
+    ) -> None:
+        """Initialise the client."""
+        self.hass = hass
+        self._session = session
+        self._url = f"{API_URL}{auth_token}"
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._digest: bytes | None = None
+        self._pending: tuple[str | None, str | None, bytes] | None = None
+        self.payload_bytes = 0
+        self.decode_time = 0.0
+
+    async def async_get_member_data(self) -> dict[str, Any] | None:
+        """Return the account payload, or None if it is unchanged since last time.
+
+        Runs through the shared request scheduler. Any client for the same
+        token sending the same validators, such as a config flow alongside
+        the loaded entry, gets the same response so joins a request already
+        in flight rather than sending its own.
+        """
+        etag, last_modified = self._etag, self._last_modified
+        response = await async_get_request_scheduler(self.hass).async_request(
+            API_HOST,
+            (self._url, etag, last_modified),
+            lambda: _async_fetch_member_data(
+                self._session, self._url, etag, last_modified
+            ),
+        )
+        if response is None:
+            return None
+        body, etag, last_modified = response
+
+        # Not every response carries validators, an identical body is just as
+        # unchanged and costs a hash rather than a decode
+        self.payload_bytes = len(body)
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if digest == self._digest:
+            return None
+
+        start = time.perf_counter()
+        # Handing work to the executor has its own cost, small accounts are
+        # quicker to decode in place
+        if len(body) > DECODE_EXECUTOR_THRESHOLD:
+            data = await self.hass.async_add_executor_job(decode_member_data, body)
+        else:
+            data = decode_member_data(body)
+        self.decode_time = time.perf_counter() - start
+
+        # Not counted as seen until it has been applied, if that fails the
+        # same response has to come back as new rather than unchanged
+        self._pending = (etag, last_modified, digest)
+        return data
+
+    @callback
+    def async_commit(self) -> None:
+        """Count the last payload returned as seen, once it has been applied."""
+        if self._pending is not None:
+            self._etag, self._last_modified, self._digest = self._pending
+            self._pending = None
+
+
+async def _async_fetch_member_data(
+    session: ClientSession, url: str, etag: str | None, last_modified: str | None
+) -> tuple[bytes, str | None, str | None] | None:
+    """Return the body and validators of a response, None if it is unchanged."""
+    headers = dict(REQUEST_HEADERS)
+    if etag is not None:
+        headers[hdrs.IF_NONE_MATCH] = etag
+    if last_modified is not None:
+        headers[hdrs.IF_MODIFIED_SINCE] = last_modified
+
+    try:
+        async with session.get(
+            url, headers=headers, timeout=ClientTimeout(total=REQUEST_TIMEOUT)
+        ) as response:
+            if response.status == HTTPStatus.NOT_MODIFIED:
+                return None
+            if response.status != HTTPStatus.OK:
+                raise RippleConnectionError("Error sending request")
+            return (
+                await response.read(),
+                response.headers.get(hdrs.ETAG),
+                response.headers.get(hdrs.LAST_MODIFIED),
+            )
+    except (ClientError, TimeoutError) as err:
+        raise RippleConnectionError("Error sending request") from err
+
+
+def decode_member_data(body: bytes) -> dict[str, Any]:
+    """Decode and check an account payload and trim it to what is applied.
+
+    Runs without touching the event loop so large payloads can be decoded in
+    the executor.
+    """
+    try:
+        data = json_loads_object(body)
+    except ValueError as err:
+        raise RippleError("Invalid response") from err
+
+    if data == {"error": "Not authenticated"}:
+        raise RippleAuthenticationError("Invalid API Key")
+    if "error" in data:
+        raise RippleError(data["error"])
+    if not data.get("generation_assets"):
+        raise RippleDevicesError("No generation assets found")
+
+    data = _pick(data, ACCOUNT_KEYS)
+    data["generation_assets"] = [
+        _normalize_asset(asset) for asset in data["generation_assets"]
+    ]
+    return data
+
+
+def _normalize_asset(asset: Any) -> Any:
+    """Return an asset with only the keys that are applied.
+
+    Missing keys are left missing so the asset still fails, and is retried,
+    when it is applied.
+    """
+    if not isinstance(asset, dict):
+        return asset
+    asset = _pick(asset, ASSET_KEYS)
+    if isinstance(generation := asset.get("generation"), dict):
+        asset["generation"] = _pick(generation, GENERATION_KEYS)
+    return asset
+
+
+def _pick(data: dict[str, Any], keys: tuple[str, ...]) -> dict[str, Any]:
+    """Return the items of a dict with the given keys."""
+    return {key: data[key] for key in keys if key in data}
+
+
+class RippleCircuitBreaker:
+    """Stop sending requests for a while after repeated connection failures."""
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        """Initialise a closed circuit."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    def state(self, now: float) -> str:
+        """Return closed, open or half_open."""
+        if self.opened_at is None:
+            return "closed"
+        if now - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow_request(self, now: float) -> bool:
+        """Return whether a request may be sent.
+
+        Once the reset timeout has passed a trial request is let through, if it
+        fails the circuit opens again for another timeout.
+        """
+        return self.state(now) != "open"
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self, now: float) -> None:
+        """Count a failure and open the circuit once there are too many."""
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = now
+
+
+class RippleRequestScheduler:
+    """Run requests to Ripple for every config entry within shared limits."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+        spacing: float = REQUEST_SPACING,
+    ) -> None:
+        """Initialise the request scheduler."""
+        self.hass = hass
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._spacing = spacing
+        self._next_start: dict[str, float] = {}
+        self._in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+
+    async def async_request(
+        self, host: str, key: Hashable, request: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Run a request, or wait on the one already running under the same key."""
+        if (task := self._in_flight.get(key)) is None:
+            task = self.hass.async_create_task(
+                self._async_run(host, request), f"ripple_energy request {host}"
+            )
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._async_request_done(key, done))
+        # Shielded so a caller that gives up does not cancel the request for
+        # everyone else waiting on it
+        return await asyncio.shield(task)
+
+    async def _async_run(
+        self, host: str, request: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Run a request once there is a free slot and the host is not too busy."""
+        async with self._semaphore:
+            now = self.hass.loop.time()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self._spacing
+            if start > now:
+                await asyncio.sleep(start - now)
+            return await request()
+
+    @callback
+    def _async_request_done(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        """Forget a finished request."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Every waiter may have gone, mark the error as seen so it isn't
+        # reported as never retrieved
+        if not task.cancelled():
+            task.exception()
+
+
+@callback
+def async_get_request_scheduler(hass: HomeAssistant) -> RippleRequestScheduler:
+    """Return the request scheduler shared by every config entry."""
+    if (scheduler := hass.data.get(DATA_REQUEST_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_REQUEST_SCHEDULER] = RippleRequestScheduler(hass)
+    return scheduler
+
+
+@callback
+def async_store_validated_payload(
+    hass: HomeAssistant,
+    auth_token: str,
+    client: RippleClient,
+    payload: dict[str, Any],
+    fetched: float,
+) -> None:
+    """Keep a payload the config flow fetched for setup to pick up.
+
+    fetched is the event loop time the payload was fetched at, its age is
+    counted from then rather than from when the flow finishes.
+    """
+    validated = hass.data.setdefault(DATA_VALIDATED_PAYLOADS, {})
+    now = hass.loop.time()
+    for token, (_, _, stored_fetched) in list(validated.items()):
+        if now - stored_fetched > VALIDATED_PAYLOAD_MAX_AGE:
+            del validated[token]
+    validated[auth_token] = (client, payload, fetched)
+
+
+@callback
+def async_pop_validated_payload(
+    hass: HomeAssistant, auth_token: str
+) -> tuple[RippleClient, dict[str, Any]] | None:
+    """Return the client and payload the config flow just fetched, if still fresh."""
+    validated = hass.data.get(DATA_VALIDATED_PAYLOADS, {})
+    if (handoff := validated.pop(auth_token, None)) is None:
+        return None
+    client, payload, fetched = handoff
+    if hass.loop.time() - fetched > VALIDATED_PAYLOAD_MAX_AGE:
+        return None
+    return client, payload
@@ -2,20 +2,25 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 
+from pyrippleapi.generation_asset import GenerationAsset
+
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_NEW_ASSETS
 from .coordinator import RippleCoordinator
-from .entity import RippleBaseEntity
+from .entity import RippleBaseEntity, async_asset_entity_enabled
 
 
 @dataclass(kw_only=True)
@@ -39,15 +44,28 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Ripple sensors from config entry."""
 
-    coordinators: RippleCoordinator = hass.data[DOMAIN][config_entry.entry_id].values()
+    coordinator: RippleCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    @callback
+    def _async_add_assets(assets: Iterable[GenerationAsset]) -> None:
+        """Add binary sensors for generation assets."""
+        sensors = []
 
-    sensors = []
+        for asset in assets:
+            for sensor in SENSORS:
+                if async_asset_entity_enabled(
+                    hass, Platform.BINARY_SENSOR, asset, sensor
+                ):
+                    sensors.append(RippleBinarySensor(coordinator, asset, sensor))
 
-    for coordinator in coordinators:
-        for sensor in SENSORS:
-            sensors.append(RippleBinarySensor(coordinator, sensor))
+        async_add_entities(sensors)
 
-    async_add_entities(sensors)
+    _async_add_assets(coordinator.assets.values())
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_ASSETS.format(config_entry.entry_id), _async_add_assets
+        )
+    )
 
 
 class RippleBinarySensor(RippleBaseEntity, BinarySensorEntity):
@@ -56,20 +74,19 @@ class RippleBinarySensor(RippleBaseEntity, BinarySensorEntity):
     def __init__(
         self,
         coordinator: RippleCoordinator,
+        asset: GenerationAsset,
         sensor_description: RippleBinarySensorEntityDescription,
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
-        self.entity_description = sensor_description
-        self._attr_unique_id = (
-            f"{self.asset.name}-{self.entity_description.translation_key}"
-        )
+        super().__init__(coordinator, asset, sensor_description)
 
     @property
-    def is_on(self) -> bool:
+    def is_on(self) -> bool | None:
         """Return true if the binary sensor is on."""
 
+        if (snapshot := self.snapshot) is None:
+            return None
         if self.entity_description.key == "status":
-            state = True if self.asset.status == "Operational" else False
+            state = snapshot[self._value_index] == "Operational"
 
         return state
@@ -11,17 +11,34 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_TOKEN, CONF_SCAN_INTERVAL
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from pyrippleapi.api import RippleAPI
 from pyrippleapi.exceptions import (
     RippleAuthenticationError,
     RippleConnectionError,
     RippleDevicesError,
     RippleError,
 )
-from pyrippleapi.generation_asset import GenerationAsset
 
-from .const import DOMAIN, POLLING_INTERVAL, ASSETS
+from .api import RippleClient, async_store_validated_payload
+from .const import (
+    DOMAIN,
+    POLLING_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    MIN_POLLING_INTERVAL,
+    CONF_ROLLUP_SCAN_INTERVAL,
+    ROLLUP_POLLING_INTERVAL,
+    CONF_MEMBER_SCAN_INTERVAL,
+    MEMBER_POLLING_INTERVAL,
+    CONF_MAX_STALE_AGE,
+    MAX_STALE_AGE,
+    CONF_ASSETS,
+    CONF_IGNORED_ASSETS,
+    CONF_EXPORT_FORMAT,
+    CONF_EXPORT_DESTINATION,
+    EXPORT_NONE,
+    EXPORT_FORMATS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,7 +58,9 @@ class RippleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialise config flow."""
         self._entry: ConfigEntry
         self._api_key: str
-        self._devices: dict[str, GenerationAsset]
+        self._client: RippleClient
+        self._data: dict[str, Any]
+        self._fetched: float
         self.reauth_entry: ConfigEntry | None = None
 
     async def async_step_user(
@@ -52,12 +71,11 @@ class RippleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             self._api_key = user_input[CONF_API_TOKEN]
 
-            ripple_api = RippleAPI(
-                auth_token=self._api_key,
-                session=async_get_clientsession(self.hass),
+            client = RippleClient(
+                self.hass, async_get_clientsession(self.hass), self._api_key
             )
             try:
-                data = await ripple_api.request(assets=ASSETS)
+                data = await client.async_get_member_data()
 
             except RippleDevicesError:
                 errors["base"] = "no_devices"
@@ -70,16 +88,53 @@ class RippleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             else:
                 await self.async_set_unique_id(data["email"])
                 self._abort_if_unique_id_configured()
-                return self.async_create_entry(
-                    title=data["email"],
-                    data={CONF_API_TOKEN: self._api_key},
-                    options={CONF_SCAN_INTERVAL: POLLING_INTERVAL},
-                )
+                self._client = client
+                self._data = data
+                self._fetched = self.hass.loop.time()
+                return await self.async_step_assets()
 
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_assets(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Choose which of the account's assets to track."""
+        names = asset_names(self._data)
+        if user_input is None:
+            return self.async_show_form(
+                step_id="assets",
+                data_schema=vol.Schema(
+                    {
+                        vol.Required(CONF_ASSETS, default=names): cv.multi_select(
+                            names
+                        ),
+                    }
+                ),
+            )
+
+        # Setup follows straight away, save it fetching the same data
+        async_store_validated_payload(
+            self.hass, self._api_key, self._client, self._data, self._fetched
+        )
+        return self.async_create_entry(
+            title=self._data["email"],
+            data={CONF_API_TOKEN: self._api_key},
+            options={
+                CONF_SCAN_INTERVAL: POLLING_INTERVAL,
+                CONF_MIN_SCAN_INTERVAL: MIN_POLLING_INTERVAL,
+                CONF_ROLLUP_SCAN_INTERVAL: ROLLUP_POLLING_INTERVAL,
+                CONF_MEMBER_SCAN_INTERVAL: MEMBER_POLLING_INTERVAL,
+                CONF_MAX_STALE_AGE: MAX_STALE_AGE,
+                CONF_EXPORT_FORMAT: EXPORT_NONE,
+                CONF_EXPORT_DESTINATION: "",
+                CONF_IGNORED_ASSETS: [
+                    name for name in names if name not in user_input[CONF_ASSETS]
+                ],
+            },
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlowHandler:
@@ -102,13 +157,22 @@ class RippleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             entry_data = self.reauth_entry.data
-            ripple_api = RippleAPI(
+            client = RippleClient(
+                self.hass,
+                async_get_clientsession(self.hass),
                 user_input[CONF_API_TOKEN],
-                session=async_get_clientsession(self.hass),
             )
             try:
-                await ripple_api.request()
+                data = await client.async_get_member_data()
+                fetched = self.hass.loop.time()
 
+                self.hass.config_entries.async_update_entry(
+                    self.reauth_entry,
+                    data={**entry_data, CONF_API_TOKEN: user_input[CONF_API_TOKEN]},
+                )
+                async_store_validated_payload(
+                    self.hass, user_input[CONF_API_TOKEN], client, data, fetched
+                )
                 await self.hass.config_entries.async_reload(self.reauth_entry.entry_id)
 
                 return self.async_abort(reason="reauth_successful")
@@ -136,8 +200,28 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle options flow."""
+        ignored = self.config_entry.options.get(CONF_IGNORED_ASSETS, [])
+        # Assets are listed from the last payload, ignored ones included, so
+        # the list is only available while the entry is loaded
+        names = []
+        if coordinator := self.hass.data.get(DOMAIN, {}).get(
+            self.config_entry.entry_id
+        ):
+            names = asset_names(coordinator.payload)
+
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            if user_input[CONF_EXPORT_FORMAT] != EXPORT_NONE and not user_input.get(
+                CONF_EXPORT_DESTINATION
+            ):
+                errors[CONF_EXPORT_DESTINATION] = "export_destination_required"
+            else:
+                if CONF_ASSETS in user_input:
+                    selected = user_input.pop(CONF_ASSETS)
+                    ignored = [name for name in names if name not in selected]
+                return self.async_create_entry(
+                    title="", data={**user_input, CONF_IGNORED_ASSETS: ignored}
+                )
 
         schema = vol.Schema(
             {
@@ -145,10 +229,58 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_SCAN_INTERVAL,
                     default=self.config_entry.options.get(CONF_SCAN_INTERVAL),
                 ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                vol.Required(
+                    CONF_MIN_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_MIN_SCAN_INTERVAL, MIN_POLLING_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                vol.Required(
+                    CONF_ROLLUP_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_ROLLUP_SCAN_INTERVAL, ROLLUP_POLLING_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_MEMBER_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_MEMBER_SCAN_INTERVAL, MEMBER_POLLING_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_MAX_STALE_AGE,
+                    default=self.config_entry.options.get(
+                        CONF_MAX_STALE_AGE, MAX_STALE_AGE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_EXPORT_FORMAT,
+                    default=self.config_entry.options.get(
+                        CONF_EXPORT_FORMAT, EXPORT_NONE
+                    ),
+                ): vol.In(EXPORT_FORMATS),
+                vol.Optional(
+                    CONF_EXPORT_DESTINATION,
+                    default=self.config_entry.options.get(CONF_EXPORT_DESTINATION, ""),
+                ): str,
             }
         )
+        if names:
+            schema = schema.extend(
+                {
+                    vol.Required(
+                        CONF_ASSETS,
+                        default=[name for name in names if name not in ignored],
+                    ): cv.multi_select(names),
+                }
+            )
+
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
+
 
-        return self.async_show_form(step_id="init", data_schema=schema)
+def asset_names(data: dict[str, Any]) -> list[str]:
+    """Return the names of the generation assets in an account payload."""
+    return [asset["name"] for asset in data.get("generation_assets", [])]
 
 
 class InvalidAuth(exceptions.HomeAssistantError):
@@ -2,4 +2,63 @@
 
 DOMAIN = "ripple_energy"
 POLLING_INTERVAL = 3600
-ASSETS = ["Graig Fatha", "Kirk Hill", "Derril Water", "Whitelaw Brae"]
+MIN_POLLING_INTERVAL = 60
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+ROLLUP_POLLING_INTERVAL = 3600
+CONF_ROLLUP_SCAN_INTERVAL = "rollup_scan_interval"
+MEMBER_POLLING_INTERVAL = 24 * 3600
+CONF_MEMBER_SCAN_INTERVAL = "member_scan_interval"
+MAX_STALE_AGE = 3 * 3600
+CONF_MAX_STALE_AGE = "max_stale_age"
+CONF_ASSETS = "assets"
+CONF_IGNORED_ASSETS = "ignored_assets"
+CONF_EXPORT_FORMAT = "export_format"
+CONF_EXPORT_DESTINATION = "export_destination"
+EXPORT_NONE = "none"
+EXPORT_LINE_PROTOCOL = "line_protocol"
+EXPORT_HTTP = "http"
+EXPORT_CSV = "csv"
+EXPORT_FORMATS = (EXPORT_NONE, EXPORT_LINE_PROTOCOL, EXPORT_HTTP, EXPORT_CSV)
+API_HOST = "rippleenergy.com"
+API_URL = f"https://{API_HOST}/rest/member_data/"
+
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60
+HISTORY_SAVE_DELAY = 300
+HISTORY_RAW_RETENTION = 2 * 24 * 3600
+HISTORY_MAX_HOURLY_SAMPLES = 366 * 24
+TELEMETRY_BUFFER_SIZE = 4096
+EXPORT_BUFFER_SIZE = 10000
+EXPORT_BATCH_SIZE = 500
+EXPORT_FLUSH_INTERVAL = 60
+EXPORT_CSV_MAX_BYTES = 10 * 1024 * 1024
+EXPORT_CSV_BACKUPS = 5
+
+DATA_REQUEST_SCHEDULER = f"{DOMAIN}_request_scheduler"
+MAX_CONCURRENT_REQUESTS = 4
+REQUEST_SPACING = 0.5
+REQUEST_TIMEOUT = 30
+DECODE_EXECUTOR_THRESHOLD = 32 * 1024
+REQUEST_RETRIES = 2
+RETRY_BACKOFF = 2
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 600
+ASSET_RETRY_BACKOFF = 60
+# Payloads in a row an asset has to be missing from before its device goes
+ASSET_REMOVAL_MISSES = 3
+POLL_JITTER = 0.1
+# Ripple's day, week, month and year figures roll over at UK midnight, give
+# it a little while to publish the new ones
+RIPPLE_TIME_ZONE = "Europe/London"
+BOUNDARY_REFRESH_DELAY = 120
+DATA_VALIDATED_PAYLOADS = f"{DOMAIN}_validated_payloads"
+VALIDATED_PAYLOAD_MAX_AGE = 60
+
+# Slices of the account payload applied on their own intervals, telemetry is
+# applied on every poll
+TIER_TELEMETRY = "telemetry"
+TIER_ROLLUPS = "rollups"
+TIER_MEMBER = "member"
+TIERS = frozenset({TIER_TELEMETRY, TIER_ROLLUPS, TIER_MEMBER})
+
+SIGNAL_NEW_ASSETS = f"{DOMAIN}_new_assets_{{}}"
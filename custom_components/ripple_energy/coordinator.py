@@ -1,45 +1,659 @@
 """Ripple energy integration coordinator class."""
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Callable, Collection
+from datetime import datetime, time as dt_time, timedelta
 import logging
+import time
+from typing import Any
 
-from pyrippleapi.exceptions import RippleConnectionError, RippleError
+from pyrippleapi.api import RippleAPI
+from pyrippleapi.exceptions import (
+    RippleAuthenticationError,
+    RippleConnectionError,
+    RippleError,
+)
 from pyrippleapi.generation_asset import GenerationAsset
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_EMAIL
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_utc_time,
+)
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .api import RippleCircuitBreaker, RippleClient
+from .const import (
+    DOMAIN,
+    ASSET_REMOVAL_MISSES,
+    ASSET_RETRY_BACKOFF,
+    BOUNDARY_REFRESH_DELAY,
+    CONF_IGNORED_ASSETS,
+    CONF_MAX_STALE_AGE,
+    EXPORT_NONE,
+    MAX_STALE_AGE,
+    POLL_JITTER,
+    REQUEST_RETRIES,
+    RETRY_BACKOFF,
+    RIPPLE_TIME_ZONE,
+    SIGNAL_NEW_ASSETS,
+    SNAPSHOT_SAVE_DELAY,
+    TIER_MEMBER,
+    TIER_ROLLUPS,
+    TIER_TELEMETRY,
+    TIERS,
+)
+from .derived import AssetDerivedValues
+from .exporter import RippleExporter
+from .forecast import AssetForecast
+from .history import RippleHistory
+from .metrics import RippleMetrics
+from .scheduler import MAX_BACKOFF_EXPONENT, RipplePollScheduler
+from .snapshot import KEY_INDEX, ROLLUP_KEYS, AssetSnapshot
+from .telemetry import TelemetryRingBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
+# Watched on every asset whether or not an entity shows it, a new figure is
+# how publication is spotted when telemetry has no timestamp
+PUBLICATION_KEY = "latest_generated"
+TELEMETRY_TIMESTAMP_FORMAT = "%Y/%m/%d %H:%M:%S"
+# The only member figures held back to the member tier, status is as live
+# as the telemetry
+HELD_MEMBER_KEYS = (
+    "member_capacity",
+    "member_capacity_units",
+    "member_expected_annual_generation",
+    "member_expected_annual_generation_units",
+)
+# Summed across every asset into the account totals
+TOTAL_KEYS = (*ROLLUP_KEYS, "member_capacity")
 
-class RippleCoordinator(DataUpdateCoordinator):
-    """Coordinator is responsible for querying the device at a specified route."""
 
-    def __init__(self, hass: HomeAssistant, asset: GenerationAsset, interval) -> None:
+async def async_apply_asset_data(
+    asset: GenerationAsset, data: dict[str, Any], tiers: Collection[str] = TIERS
+) -> None:
+    """Update tiers of a generation asset from its slice of the account payload."""
+    generation = data["generation"]
+    if TIER_MEMBER in tiers:
+        await asset.update_asset_info(data)
+    elif TIER_TELEMETRY in tiers:
+        await asset.update_asset_info(
+            {**data, **{key: getattr(asset, key) for key in HELD_MEMBER_KEYS}}
+        )
+    if TIER_TELEMETRY in tiers:
+        # get_telemetry rewrites the timestamp in place, hand it a copy so the
+        # account payload stays as the API returned it
+        await asset.get_telemetry(
+            {"latest_telemetry": dict(generation["latest_telemetry"])}
+        )
+        # The latest figures are live, only the period rollups wait for
+        # their tier, set the same way get_generation sets them
+        if latest := generation["latest"]:
+            asset.generation_data["latest_earned"] = latest["estimated_savings"]
+            asset.generation_data["latest_generated"] = latest["generation"]
+    if TIER_ROLLUPS in tiers:
+        await asset.get_generation(generation)
+
+
+def telemetry_timestamp(asset: GenerationAsset) -> datetime | None:
+    """Return when the asset's latest telemetry was recorded, if Ripple sent it."""
+    if (timestamp := asset.latest_telemetry.get("timestamp")) is None:
+        return None
+    recorded = datetime.strptime(timestamp, TELEMETRY_TIMESTAMP_FORMAT)
+    # GenerationAsset fills in year one when the telemetry has no timestamp
+    if recorded.year == 1:
+        return None
+    return recorded.replace(tzinfo=dt_util.UTC)
+
+
+class RippleCoordinator(DataUpdateCoordinator[dict[str, GenerationAsset]]):
+    """Coordinator is responsible for querying the account and updating its assets."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: RippleAPI,
+        client: RippleClient,
+        min_interval,
+        max_interval,
+        tier_intervals: dict[str, float],
+        store: Store,
+    ) -> None:
         """Initialise a custom coordinator."""
         super().__init__(
             hass,
             _LOGGER,
-            name=asset.name,
-            update_interval=timedelta(seconds=interval),
+            name=DOMAIN,
+            update_interval=timedelta(seconds=max_interval),
         )
         assert self.config_entry is not None
         self.config_entry: ConfigEntry
-        self.asset = asset
-        self.device_info = DeviceInfo(
-            identifiers={(DOMAIN, asset.name)}, name=asset.name
+        self.api = api
+        self.client = client
+        self.assets: dict[str, GenerationAsset] = {}
+        self.ignored_assets: set[str] = set(
+            self.config_entry.options.get(CONF_IGNORED_ASSETS, [])
+        )
+        self.payload: dict[str, Any] = {}
+        self._store = store
+        self.poll_scheduler = RipplePollScheduler(min_interval, max_interval)
+        self.history = RippleHistory(hass, self.config_entry)
+        # A reload mustn't lose the samples waiting to be saved, nor save
+        # them late over what the next instance has written
+        self.config_entry.async_on_unload(self.history.async_flush)
+        self.metrics = RippleMetrics()
+        self.circuit_breaker = RippleCircuitBreaker()
+        self.last_fresh: datetime | None = None
+        self._unsub_boundary_refresh: CALLBACK_TYPE | None = None
+        self.failed_assets: dict[str, int] = {}
+        self.missing_assets: dict[str, int] = {}
+        self._unsub_asset_retry: CALLBACK_TYPE | None = None
+        self.config_entry.async_on_unload(self._async_cancel_asset_retry)
+        self.exporter: RippleExporter | None = None
+        self.config_entry.async_on_unload(self._async_stop_export)
+        self._values: dict[tuple[str, str], Any] = {}
+        self._changed: set[tuple[str, str]] | None = None
+        self.snapshots: dict[str, AssetSnapshot] = {}
+        self.derived: dict[str, AssetDerivedValues] = {}
+        self.forecasts: dict[str, AssetForecast] = {}
+        self.telemetry: dict[str, TelemetryRingBuffer] = {}
+        self.totals: dict[str, float] = {}
+        self._key_table: list[tuple[tuple[str, str], Callable[[], Any]]] | None = None
+        self.tier_intervals = tier_intervals
+        self.tier_refreshed: dict[str, datetime] = {}
+        self._pending_tiers: set[str] = set()
+
+    @callback
+    def async_set_intervals(
+        self,
+        min_interval: float,
+        max_interval: float,
+        tier_intervals: dict[str, float],
+    ) -> None:
+        """Apply new polling intervals and reschedule the next poll in place."""
+        self.poll_scheduler.set_bounds(min_interval, max_interval)
+        self.tier_intervals = tier_intervals
+        self.update_interval = self.poll_scheduler.next_interval(dt_util.utcnow())
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def async_schedule_boundary_refresh(self) -> CALLBACK_TYPE:
+        """Refresh just after each UK midnight, alongside the regular polls.
+
+        Returns a function that stops the boundary refreshes.
+        """
+        time_zone = dt_util.get_time_zone(RIPPLE_TIME_ZONE)
+        tomorrow = dt_util.now(time_zone).date() + timedelta(days=1)
+        boundary = datetime.combine(tomorrow, dt_time(), time_zone)
+        self._unsub_boundary_refresh = async_track_point_in_utc_time(
+            self.hass,
+            self._async_boundary_refresh,
+            boundary + timedelta(seconds=BOUNDARY_REFRESH_DELAY),
+        )
+        return self._async_cancel_boundary_refresh
+
+    @callback
+    def _async_cancel_boundary_refresh(self) -> None:
+        """Stop the boundary refreshes."""
+        if self._unsub_boundary_refresh is not None:
+            self._unsub_boundary_refresh()
+            self._unsub_boundary_refresh = None
+
+    async def _async_boundary_refresh(self, _now: datetime) -> None:
+        """Pick up the rollups that have just reset."""
+        self.async_schedule_boundary_refresh()
+        # The rollups tier may not be due for a while yet but all of it has
+        # just changed
+        self.tier_refreshed.pop(TIER_ROLLUPS, None)
+        await self.async_refresh()
+
+    @callback
+    def _async_schedule_asset_retry(self, failures: int) -> None:
+        """Refresh early, backing off, while some assets fail to apply."""
+        if self._unsub_asset_retry is not None:
+            return
+        delay = min(
+            ASSET_RETRY_BACKOFF * 2 ** min(failures - 1, MAX_BACKOFF_EXPONENT),
+            self.poll_scheduler.max_interval,
+        )
+        self._unsub_asset_retry = async_call_later(
+            self.hass, delay, self._async_retry_assets
         )
 
-    async def _async_update_data(self) -> None:
-        """Fetch the data from the device."""
+    async def _async_retry_assets(self, _now: datetime) -> None:
+        """Refresh to retry the assets that failed to apply."""
+        self._unsub_asset_retry = None
+        await self.async_request_refresh()
+
+    @callback
+    def _async_cancel_asset_retry(self) -> None:
+        """Stop any pending asset retry."""
+        if self._unsub_asset_retry is not None:
+            self._unsub_asset_retry()
+            self._unsub_asset_retry = None
+
+    async def _async_update_data(self) -> dict[str, GenerationAsset]:
+        """Fetch the data for every asset on the account with a single request."""
         try:
-            await self.asset.update_data()
-        except (RippleError, RippleConnectionError) as err:
-            raise UpdateFailed(err) from err
+            data = await self._async_fetch()
+        except RippleAuthenticationError as err:
+            # Stale data would hide that the token needs replacing
+            self.metrics.record_failure(dt_util.utcnow(), err)
+            raise ConfigEntryAuthFailed(
+                f"Credentials expired for {self.config_entry.title}"
+            ) from err
+        except RippleError as err:
+            now = dt_util.utcnow()
+            self.metrics.record_failure(now, err)
+            self.poll_scheduler.record_failure()
+            self.update_interval = self.poll_scheduler.next_interval(now)
+            if not self._can_serve_stale(now):
+                raise UpdateFailed(err) from err
+            # Keep entities on the last good values rather than flapping them
+            # all unavailable, until those values are too old to trust
+            _LOGGER.debug(
+                "Serving data from %s while Ripple is failing: %s", self.last_fresh, err
+            )
+            if self.last_update_success:
+                self._changed = set()
+            return self.assets
+
+        if data is None:
+            self.last_fresh = dt_util.utcnow()
+            self.metrics.record_unchanged(self.last_fresh)
+            # Slices of the last payload held back until their tier was due
+            # still need applying even though Ripple has nothing new
+            tiers = self._pending_tiers & self._due_tiers(dt_util.utcnow())
+            # As do assets that failed to, applying them again is what
+            # schedules the next retry if they still fail, and missing assets
+            # are another poll closer to being removed
+            if self.failed_assets or self.missing_assets:
+                tiers.add(TIER_TELEMETRY)
+            if tiers:
+                assets = await self._async_apply_tiers(self.payload, tiers)
+                await self._async_record()
+                return assets
+            # Otherwise there is nothing to apply, store or notify entities about
+            self.poll_scheduler.record_update(None)
+            self.update_interval = self.poll_scheduler.next_interval(dt_util.utcnow())
+            if self.last_update_success:
+                self._changed = set()
+            return self.assets
+
+        return await self.async_process_payload(data)
+
+    async def _async_fetch(self) -> dict[str, Any] | None:
+        """Fetch member data, retrying connection errors a few times."""
+        for attempt in range(REQUEST_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+            if not self.circuit_breaker.allow_request(self.hass.loop.time()):
+                raise RippleConnectionError(
+                    "Not sending requests after repeated connection failures"
+                )
+
+            start = time.perf_counter()
+            try:
+                data = await self.client.async_get_member_data()
+            except RippleConnectionError as err:
+                self.metrics.record_request(time.perf_counter() - start)
+                self.circuit_breaker.record_failure(self.hass.loop.time())
+                error = err
+                continue
+            except RippleError:
+                # Anything else is Ripple answering, asking again won't help
+                self.metrics.record_request(time.perf_counter() - start)
+                raise
+            self.metrics.record_request(time.perf_counter() - start)
+            self.circuit_breaker.record_success()
+            return data
+
+        raise error
+
+    async def _async_record(self) -> None:
+        """Keep a refresh in the local history and pass it to the exporter."""
+        self.history.async_record(self.snapshots)
+        if self.exporter is not None:
+            await self.exporter.async_record(
+                dt_util.utcnow().timestamp(), self.snapshots.values()
+            )
+
+    async def async_set_export(self, export_format: str, destination: str) -> None:
+        """Start, stop or replace the exporter, writing out what it buffered."""
+        if (exporter := self.exporter) is not None:
+            if (exporter.export_format, exporter.destination) == (
+                export_format,
+                destination,
+            ):
+                return
+            self.exporter = None
+            await exporter.async_stop()
+        if export_format != EXPORT_NONE and destination:
+            self.exporter = RippleExporter(self.hass, export_format, destination)
+            self.exporter.async_start()
+
+    async def _async_stop_export(self) -> None:
+        """Write out anything the exporter buffered and stop it."""
+        await self.async_set_export(EXPORT_NONE, "")
+
+    def _can_serve_stale(self, now: datetime) -> bool:
+        """Return whether the last good data is recent enough to keep serving."""
+        max_age = self.config_entry.options.get(CONF_MAX_STALE_AGE, MAX_STALE_AGE)
+        return (
+            bool(self.assets)
+            and self.last_fresh is not None
+            and (now - self.last_fresh).total_seconds() <= max_age
+        )
+
+    async def async_process_payload(
+        self, data: dict[str, Any]
+    ) -> dict[str, GenerationAsset]:
+        """Apply a payload fresh from Ripple and keep it."""
+        self.last_fresh = dt_util.utcnow()
+        self.metrics.record_decode(self.client.payload_bytes, self.client.decode_time)
+        self._pending_tiers = set(TIERS)
+        assets = await self._async_apply_tiers(
+            data, self._due_tiers(dt_util.utcnow())
+        )
+        self._store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+        await self._async_record()
+        self.metrics.record_success(dt_util.utcnow())
+        self.client.async_commit()
+
+        return assets
+
+    async def _async_apply_tiers(
+        self, data: dict[str, Any], tiers: set[str]
+    ) -> dict[str, GenerationAsset]:
+        """Apply the due tiers of a payload and hold the rest back."""
+        now = dt_util.utcnow()
+        assets = await self.async_apply_payload(data, tiers, polled=True)
+        self.tier_refreshed.update(dict.fromkeys(tiers, now))
+        self._pending_tiers -= tiers
+        return assets
+
+    def _due_tiers(self, now: datetime) -> set[str]:
+        """Return the tiers whose interval has passed since they were applied.
+
+        Polls are brought forward by up to the jitter, a tier is due on one
+        that is early by no more than that rather than waiting a whole poll.
+        """
+        return {
+            tier
+            for tier in TIERS
+            if (refreshed := self.tier_refreshed.get(tier)) is None
+            or (now - refreshed).total_seconds()
+            >= self.tier_intervals.get(tier, 0) * (1 - POLL_JITTER)
+        }
+
+    async def async_apply_payload(
+        self,
+        data: dict[str, Any],
+        tiers: Collection[str] = TIERS,
+        polled: bool = False,
+    ) -> dict[str, GenerationAsset]:
+        """Apply tiers of an account payload to the assets and record what changed.
+
+        Only a payload Ripple has just confirmed, rather than one reapplied
+        from memory or storage, is polled.
+        """
+        start = time.perf_counter()
+        asset_parse_time = {}
+        new_assets = []
+        seen = set()
+        unnamed = False
+        failed: dict[str, int] = {}
+        now = dt_util.utcnow()
+        for index, asset_data in enumerate(data["generation_assets"]):
+            # Known by position until its name is read, in case that fails
+            name = f"#{index}"
+            asset_start = time.perf_counter()
+            # One asset Ripple sends in an unexpected shape shouldn't hold up
+            # the rest, it is left out until a later payload applies cleanly
+            try:
+                name = asset_data["name"]
+                if name in self.ignored_assets:
+                    continue
+                seen.add(name)
+                if (asset := self.assets.get(name)) is None:
+                    new_asset = GenerationAsset(self.api, asset_data, data["email"])
+                    # New assets need every tier to know which entities they have
+                    await async_apply_asset_data(new_asset, asset_data, TIERS)
+                    self._async_update_asset(name, new_asset, now)
+                    self.assets[name] = new_asset
+                    new_assets.append(new_asset)
+                else:
+                    await async_apply_asset_data(asset, asset_data, tiers)
+                    self._async_update_asset(name, asset, now)
+            except (KeyError, TypeError, ValueError) as err:
+                unnamed |= name not in seen
+                failed[name] = self.failed_assets.get(name, 0) + 1
+                _LOGGER.warning(
+                    "Unable to apply data for %s (attempt %s): %r",
+                    name,
+                    failed[name],
+                    err,
+                )
+                continue
+            asset_parse_time[name] = time.perf_counter() - asset_start
+
+        # One partial response shouldn't cost an asset its devices and entity
+        # customisations, it is only removed once it has been missing from
+        # several polls in a row. An asset whose name couldn't be read may be
+        # one of them, so that poll doesn't count towards it.
+        missing = {
+            name: self.missing_assets.get(name, 0) + (polled and not unnamed)
+            for name in self.assets.keys() - seen - self.ignored_assets
+        }
+        # Assets the user deselected go straight away
+        removed = self.assets.keys() & self.ignored_assets
+        removed.update(
+            name for name, misses in missing.items() if misses >= ASSET_REMOVAL_MISSES
+        )
+        if removed:
+            self._async_remove_assets(removed)
+        for name in removed:
+            missing.pop(name, None)
+        unavailable = failed.keys() | missing.keys()
+        was_unavailable = self.failed_assets.keys() | self.missing_assets.keys()
+        recovered = was_unavailable - unavailable
+        newly_failed = unavailable - was_unavailable
+        self.failed_assets = failed
+        self.missing_assets = missing
+        if failed:
+            self._async_schedule_asset_retry(max(failed.values()))
+
+        totals: dict[str, float] = {}
+        # Failed assets still count towards the totals with their last values
+        for snapshot in self.snapshots.values():
+            for key in TOTAL_KEYS:
+                if (value := snapshot.get(key)) is not None:
+                    totals[key] = totals.get(key, 0) + value
+        # Summing floats leaves noise in the last digits Ripple never sent
+        self.totals = {key: round(total, 6) for key, total in totals.items()}
+
+        if new_assets or removed:
+            self._key_table = None
+        values = {
+            context: read_value() for context, read_value in self._async_get_key_table()
+        }
+        changed = {
+            context
+            for context, value in values.items()
+            if context not in self._values
+            or self._values[context] != value
+            # Entities of assets that failed, went missing or came back
+            # change availability
+            or context[0] in recovered
+            or context[0] in newly_failed
+        }
+        self.poll_scheduler.record_update(self._publication_time(changed))
+        self.update_interval = self.poll_scheduler.next_interval(dt_util.utcnow())
+
+        # Entities are unavailable after a failed refresh so all of them need
+        # to write state on recovery, not only the ones whose value moved
+        if self.last_update_success:
+            self._changed = changed
+        self._values = values
+        self.payload = data
+        self.metrics.record_parse(
+            time.perf_counter() - start,
+            len(data["generation_assets"]),
+            asset_parse_time,
+        )
+
+        # Platforms that are already set up add entities for assets that
+        # joined the account, before that they pick them up from self.assets
+        if new_assets:
+            async_dispatcher_send(
+                self.hass,
+                SIGNAL_NEW_ASSETS.format(self.config_entry.entry_id),
+                new_assets,
+            )
+
+        return self.assets
+
+    @callback
+    def _async_update_asset(
+        self, name: str, asset: GenerationAsset, now: datetime
+    ) -> None:
+        """Work out what follows from an asset's new values and snapshot them.
+
+        Raises like applying the asset does when a value isn't what Ripple
+        normally sends, so the asset fails alone and keeps its last snapshot.
+        """
+        if (derived := self.derived.get(name)) is None:
+            derived = self.derived[name] = AssetDerivedValues()
+        recorded = telemetry_timestamp(asset)
+        derived.update(asset, now, recorded)
+        if (forecast := self.forecasts.get(name)) is None:
+            forecast = self.forecasts[name] = AssetForecast()
+        forecast.update(asset, self.history.assets.get(name), now)
+        # Entities read from a snapshot replaced whole, never from the asset
+        # while it is part way through an update
+        snapshot = AssetSnapshot.from_asset(asset, derived, forecast, recorded)
+        for key in TOTAL_KEYS:
+            value = snapshot.get(key)
+            if value is not None and not isinstance(value, (int, float)):
+                raise TypeError(f"{key} is {value!r}, not a number")
+        self.snapshots[name] = snapshot
+        if (telemetry := self.telemetry.get(name)) is None:
+            telemetry = self.telemetry[name] = TelemetryRingBuffer()
+        telemetry.append(asset, now, recorded)
+
+    @callback
+    def _async_remove_assets(self, names: set[str]) -> None:
+        """Forget assets that left the account and remove their devices."""
+        device_registry = dr.async_get(self.hass)
+        for name in names:
+            _LOGGER.debug("Removing generation asset %s", name)
+            del self.assets[name]
+            self.snapshots.pop(name, None)
+            self.derived.pop(name, None)
+            self.forecasts.pop(name, None)
+            self.telemetry.pop(name, None)
+            # Removing the device removes its entities along with it
+            if device := device_registry.async_get_device(
+                identifiers={(DOMAIN, name)}
+            ):
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=self.config_entry.entry_id
+                )
+
+    def _publication_time(self, changed: set[tuple[str, str]]) -> datetime | None:
+        """Return when Ripple published the figures that were just applied."""
+        recorded = [
+            snapshot.recorded
+            for snapshot in self.snapshots.values()
+            if snapshot.recorded is not None
+        ]
+        if recorded:
+            return max(recorded)
+        # Without telemetry timestamps fall back to when a new generation
+        # figure was first seen, the first payload applied has nothing to diff
+        if self._values and any(key == PUBLICATION_KEY for _, key in changed):
+            return dt_util.utcnow()
+        return None
+
+    @callback
+    def _async_get_key_table(self) -> list[tuple[tuple[str, str], Callable[[], Any]]]:
+        """Return how to read each value a listener is subscribed to."""
+        if self._key_table is None:
+            contexts = {
+                context
+                for _, context in self._listeners.values()
+                if context is not None
+            }
+            contexts.update((name, PUBLICATION_KEY) for name in self.assets)
+            self._key_table = [
+                (context, read_value)
+                for context in contexts
+                if (read_value := self._value_reader(context)) is not None
+            ]
+        return self._key_table
+
+    def _value_reader(self, context: tuple[str, str]) -> Callable[[], Any] | None:
+        """Return a function reading the value a listener context shows."""
+        name, key = context
+        # Account wide totals are keyed by the config entry rather than an asset
+        if name == self.config_entry.entry_id:
+            return lambda: self.totals.get(key)
+        if name not in self.snapshots or (index := KEY_INDEX.get(key)) is None:
+            return None
+        return lambda: self.snapshots[name][index]
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates and start watching the value they show."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        self._key_table = None
+        # The entity writes the value it shows when it is added, only later
+        # changes should notify it
+        if (
+            context is not None
+            and context not in self._values
+            and (read_value := self._value_reader(context)) is not None
+        ):
+            self._values[context] = read_value()
+
+        @callback
+        def remove() -> None:
+            """Remove update listener and stop watching its value."""
+            remove_listener()
+            self._key_table = None
+
+        return remove
+
+    @callback
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return the last good account payload to persist."""
+        return {"timestamp": dt_util.utcnow().isoformat(), "payload": self.payload}
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose value changed in the last refresh."""
+        changed, self._changed = self._changed, None
+        if changed is None or not self.last_update_success:
+            self.metrics.record_notified(len(self._listeners))
+            super().async_update_listeners()
+            return
+
+        update_callbacks = [
+            update_callback
+            for update_callback, context in self._listeners.values()
+            if context is None or context in changed
+        ]
+        self.metrics.record_notified(len(update_callbacks))
+        for update_callback in update_callbacks:
+            update_callback()
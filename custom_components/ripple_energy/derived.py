@@ -0,0 +1,105 @@
+"""Values derived from Ripple generation assets as each refresh is applied."""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+
+from pyrippleapi.generation_asset import GenerationAsset
+
+DAY = 24 * 3600
+WEEK = 7 * DAY
+DERIVED_KEYS = ("capacity_factor", "wind_speed_24h", "wind_speed_7d", "uptime")
+
+
+class RollingWindow:
+    """Weighted mean of the samples in a trailing window of time.
+
+    Running totals are kept as samples are added and evicted so each sample
+    costs O(1) amortised, however long the window.
+    """
+
+    def __init__(self, duration: float) -> None:
+        """Initialise an empty window."""
+        self.duration = duration
+        self._samples: deque[tuple[float, float, float]] = deque()
+        self._total = 0.0
+        self._weight = 0.0
+
+    def add(self, timestamp: float, value: float, weight: float = 1.0) -> None:
+        """Add a sample and evict those that have left the window."""
+        self._samples.append((timestamp, value, weight))
+        self._total += value * weight
+        self._weight += weight
+
+        cutoff = timestamp - self.duration
+        while self._samples[0][0] <= cutoff:
+            _, old_value, old_weight = self._samples.popleft()
+            self._total -= old_value * old_weight
+            self._weight -= old_weight
+
+    @property
+    def mean(self) -> float | None:
+        """Return the weighted mean of the window, None if it is empty."""
+        if self._weight <= 0:
+            return None
+        return self._total / self._weight
+
+
+class AssetDerivedValues:
+    """Capacity factor, rolling wind speeds and uptime for one asset."""
+
+    def __init__(self) -> None:
+        """Initialise with nothing seen yet."""
+        self.capacity_factor: float | None = None
+        self._wind_speed_24h = RollingWindow(DAY)
+        self._wind_speed_7d = RollingWindow(WEEK)
+        self._uptime = RollingWindow(WEEK)
+        self._last_telemetry: float | None = None
+        self._last_seen: float | None = None
+        self._operational = False
+
+    def update(
+        self, asset: GenerationAsset, now: datetime, recorded: datetime | None
+    ) -> None:
+        """Fold the asset's latest values in, once per refresh."""
+        generated = asset.generation_data.get("latest_generated")
+        capacity = asset.member_capacity
+        if generated is None or not capacity:
+            self.capacity_factor = None
+        else:
+            # Latest generation is in kW and member capacity in W
+            self.capacity_factor = float(generated) * 1000 / float(capacity) * 100
+
+        # Telemetry is only averaged once however many polls return it
+        timestamp = (recorded or now).timestamp()
+        wind_speed = asset.latest_telemetry.get("wind_speed_avg")
+        if wind_speed is not None and (
+            self._last_telemetry is None or timestamp > self._last_telemetry
+        ):
+            self._wind_speed_24h.add(timestamp, float(wind_speed))
+            self._wind_speed_7d.add(timestamp, float(wind_speed))
+            self._last_telemetry = timestamp
+
+        # The status seen at the last refresh is assumed to have held until now
+        seen = now.timestamp()
+        if self._last_seen is not None and seen > self._last_seen:
+            self._uptime.add(seen, float(self._operational), seen - self._last_seen)
+        self._last_seen = seen
+        self._operational = asset.status == "Operational"
+
+    @property
+    def wind_speed_24h(self) -> float | None:
+        """Return the mean wind speed over the last day."""
+        return self._wind_speed_24h.mean
+
+    @property
+    def wind_speed_7d(self) -> float | None:
+        """Return the mean wind speed over the last week."""
+        return self._wind_speed_7d.mean
+
+    @property
+    def uptime(self) -> float | None:
+        """Return the percentage of the last week the asset was operational."""
+        if (mean := self._uptime.mean) is None:
+            return None
+        return mean * 100
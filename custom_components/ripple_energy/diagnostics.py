@@ -0,0 +1,63 @@
+"""Diagnostics support for the Ripple energy integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_TOKEN, CONF_EMAIL
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_MAX_STALE_AGE, DOMAIN, MAX_STALE_AGE, TIERS
+from .coordinator import RippleCoordinator
+
+TO_REDACT = {CONF_API_TOKEN, CONF_EMAIL, "title", "unique_id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: RippleCoordinator = hass.data[DOMAIN][entry.entry_id]
+    poll_scheduler = coordinator.poll_scheduler
+    circuit_breaker = coordinator.circuit_breaker
+    last_fresh = coordinator.last_fresh
+    exporter = coordinator.exporter
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "metrics": coordinator.metrics.as_dict(),
+        "poll_scheduler": {
+            "min_interval": poll_scheduler.min_interval,
+            "max_interval": poll_scheduler.max_interval,
+            "learned_period": poll_scheduler.period,
+            "last_published": poll_scheduler.last_published,
+            "failures": poll_scheduler.failures,
+            "update_interval": coordinator.update_interval.total_seconds(),
+        },
+        "staleness": {
+            "last_fresh": last_fresh,
+            "age": (
+                None
+                if last_fresh is None
+                else (dt_util.utcnow() - last_fresh).total_seconds()
+            ),
+            "max_age": entry.options.get(CONF_MAX_STALE_AGE, MAX_STALE_AGE),
+        },
+        "circuit_breaker": {
+            "state": circuit_breaker.state(hass.loop.time()),
+            "failures": circuit_breaker.failures,
+        },
+        "failed_assets": coordinator.failed_assets,
+        "missing_assets": coordinator.missing_assets,
+        "exporter": None if exporter is None else exporter.as_dict(),
+        "tiers": {
+            tier: {
+                "interval": coordinator.tier_intervals.get(tier, 0),
+                "last_refreshed": coordinator.tier_refreshed.get(tier),
+            }
+            for tier in sorted(TIERS)
+        },
+        "payload": async_redact_data(coordinator.payload, TO_REDACT),
+    }
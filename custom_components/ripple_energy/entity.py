@@ -1,9 +1,66 @@
 """Base class for Ripple energy entities."""
 
-from homeassistant.helpers.entity import Entity
+from typing import Any
+
+from pyrippleapi.generation_asset import GenerationAsset
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo, Entity, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .const import DOMAIN
 from .coordinator import RippleCoordinator
+from .snapshot import KEY_INDEX, AssetSnapshot
+
+
+def asset_unique_id(asset: GenerationAsset, description: EntityDescription) -> str:
+    """Return the unique id of a generation asset entity."""
+    return f"{asset.name}-{description.translation_key}"
+
+
+def account_unique_id(entry: ConfigEntry, description: EntityDescription) -> str:
+    """Return the unique id of an entity describing the whole account."""
+    return f"{entry.entry_id}-{description.translation_key}"
+
+
+@callback
+def async_asset_entity_enabled(
+    hass: HomeAssistant,
+    platform: Platform,
+    asset: GenerationAsset,
+    description: EntityDescription,
+) -> bool:
+    """Return False if the entity registry has a generation asset entity disabled.
+
+    Disabled entities are never added to Home Assistant so there is no need to
+    build them, enabling one reloads the config entry which creates it.
+    """
+    return _async_entity_enabled(hass, platform, asset_unique_id(asset, description))
+
+
+@callback
+def async_account_entity_enabled(
+    hass: HomeAssistant,
+    platform: Platform,
+    entry: ConfigEntry,
+    description: EntityDescription,
+) -> bool:
+    """Return False if the entity registry has an account entity disabled."""
+    return _async_entity_enabled(hass, platform, account_unique_id(entry, description))
+
+
+@callback
+def _async_entity_enabled(
+    hass: HomeAssistant, platform: Platform, unique_id: str
+) -> bool:
+    """Return False if the entity registry has the entity disabled."""
+    entity_registry = er.async_get(hass)
+    entity_id = entity_registry.async_get_entity_id(platform, DOMAIN, unique_id)
+    return entity_id is None or not entity_registry.entities[entity_id].disabled
 
 
 class RippleBaseEntity(CoordinatorEntity[RippleCoordinator], Entity):
@@ -12,9 +69,57 @@ class RippleBaseEntity(CoordinatorEntity[RippleCoordinator], Entity):
     def __init__(
         self,
         coordinator: RippleCoordinator,
+        asset: GenerationAsset,
+        description: EntityDescription,
     ) -> None:
         """Initialize the base entity."""
-        super().__init__(coordinator)
-        self.asset = coordinator.asset
-        self._attr_device_info = coordinator.device_info
+        super().__init__(coordinator, context=(asset.name, description.key))
+        self.asset = asset
+        self.entity_description = description
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, asset.name)}, name=asset.name
+        )
+        self._attr_has_entity_name = True
+        self._attr_unique_id = asset_unique_id(asset, description)
+        self._value_index = KEY_INDEX.get(description.key)
+
+    @property
+    def snapshot(self) -> AssetSnapshot | None:
+        """Return the asset's values as of the last refresh.
+
+        None once the asset has left the account, until its entities are
+        removed along with its device.
+        """
+        return self.coordinator.snapshots.get(self.asset.name)
+
+    @property
+    def available(self) -> bool:
+        """Return False while the asset's data fails to apply or is missing."""
+        return (
+            super().available
+            and self.asset.name not in self.coordinator.failed_assets
+            and self.asset.name not in self.coordinator.missing_assets
+            and self.snapshot is not None
+        )
+
+
+class RippleAccountEntity(CoordinatorEntity[RippleCoordinator], Entity):
+    """Base class for entities describing the whole ripple account."""
+
+    def __init__(
+        self,
+        coordinator: RippleCoordinator,
+        description: EntityDescription,
+        context: Any = None,
+    ) -> None:
+        """Initialize the account entity."""
+        super().__init__(coordinator, context=context)
+        entry = coordinator.config_entry
+        self.entity_description = description
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            entry_type=DeviceEntryType.SERVICE,
+        )
         self._attr_has_entity_name = True
+        self._attr_unique_id = account_unique_id(entry, description)
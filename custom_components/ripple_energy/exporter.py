@@ -0,0 +1,249 @@
+"""Bulk export of Ripple refreshes to InfluxDB line protocol or CSV."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Iterable
+import csv
+from datetime import datetime, timedelta
+import logging
+import os
+from typing import Any
+
+from aiohttp import ClientError, ClientTimeout, hdrs
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    EXPORT_BATCH_SIZE,
+    EXPORT_BUFFER_SIZE,
+    EXPORT_CSV,
+    EXPORT_CSV_BACKUPS,
+    EXPORT_CSV_MAX_BYTES,
+    EXPORT_FLUSH_INTERVAL,
+    EXPORT_HTTP,
+    REQUEST_TIMEOUT,
+)
+from .snapshot import SNAPSHOT_KEYS, AssetSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+CSV_HEADER = ("timestamp", "asset", *SNAPSHOT_KEYS)
+
+# When a refresh was applied and the asset's values as of that refresh
+ExportRecord = tuple[float, AssetSnapshot]
+
+
+class RippleExporter:
+    """Buffer a record per asset each refresh and write them out in bulk."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        export_format: str,
+        destination: str,
+        buffer_size: int = EXPORT_BUFFER_SIZE,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> None:
+        """Initialise an exporter with nothing buffered."""
+        self.hass = hass
+        self.export_format = export_format
+        self.destination = destination
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self._buffer: deque[ExportRecord] = deque(maxlen=buffer_size)
+        self._flush_task: asyncio.Task[None] | None = None
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self.exported = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+        self.last_error: str | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Flush on an interval as well as whenever a batch fills."""
+        self._unsub_flush = async_track_time_interval(
+            self.hass,
+            self._async_flush_interval,
+            timedelta(seconds=EXPORT_FLUSH_INTERVAL),
+        )
+
+    async def async_stop(self) -> None:
+        """Stop flushing on an interval and write out whatever is buffered."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        await self.async_flush()
+
+    async def async_record(
+        self, timestamp: float, snapshots: Iterable[AssetSnapshot]
+    ) -> None:
+        """Buffer a record for every asset from a refresh.
+
+        A refresh that would overfill the buffer waits for it to be written
+        out first, the oldest records are only dropped if that fails.
+        """
+        records = [(timestamp, snapshot) for snapshot in snapshots]
+        if len(self._buffer) + len(records) > self.buffer_size:
+            await self.async_flush()
+        if (overflow := len(self._buffer) + len(records) - self.buffer_size) > 0:
+            self.dropped += overflow
+            _LOGGER.warning(
+                "Export buffer for %s is full, dropping %s records",
+                self.destination,
+                overflow,
+            )
+        self._buffer.extend(records)
+        if len(self._buffer) >= self.batch_size:
+            self._async_start_flush()
+
+    async def async_flush(self) -> None:
+        """Write out everything buffered, after any write already running."""
+        if self._flush_task is not None:
+            await self._flush_task
+        if self._buffer:
+            await self._async_start_flush()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the exporter's state for diagnostics."""
+        return {
+            "format": self.export_format,
+            "buffered": len(self._buffer),
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "failed_flushes": self.failed_flushes,
+            "last_error": self.last_error,
+        }
+
+    async def _async_flush_interval(self, _now: datetime) -> None:
+        """Write out whatever has been buffered since the last flush."""
+        if self._buffer:
+            self._async_start_flush()
+
+    @callback
+    def _async_start_flush(self) -> asyncio.Task[None]:
+        """Start writing out the buffer, unless a write is already running."""
+        if self._flush_task is None:
+            self._flush_task = self.hass.async_create_task(
+                self._async_write_buffer(), f"{DOMAIN} export"
+            )
+        return self._flush_task
+
+    async def _async_write_buffer(self) -> None:
+        """Write the buffered records, putting them back if it fails."""
+        records = list(self._buffer)
+        self._buffer.clear()
+        try:
+            await self._async_write(records)
+        except (ClientError, OSError, TimeoutError) as err:
+            self.failed_flushes += 1
+            self.last_error = str(err)
+            _LOGGER.warning(
+                "Unable to export %s records to %s: %s",
+                len(records),
+                self.destination,
+                err,
+            )
+            # Retried with the next flush ahead of anything buffered since,
+            # if there isn't room for both the oldest go
+            pending = len(records) + len(self._buffer)
+            self._buffer = deque((*records, *self._buffer), maxlen=self.buffer_size)
+            self.dropped += pending - len(self._buffer)
+        else:
+            self.exported += len(records)
+            self.last_error = None
+        finally:
+            self._flush_task = None
+
+    async def _async_write(self, records: list[ExportRecord]) -> None:
+        """Write a batch of records to the destination."""
+        if self.export_format == EXPORT_HTTP:
+            body = await self.hass.async_add_executor_job(
+                encode_line_protocol, records
+            )
+            async with async_get_clientsession(self.hass).post(
+                self.destination,
+                data=body,
+                headers={hdrs.CONTENT_TYPE: "text/plain; charset=utf-8"},
+                timeout=ClientTimeout(total=REQUEST_TIMEOUT),
+                raise_for_status=True,
+            ):
+                return
+
+        # Snapshots never change so they are safe to read from the executor
+        path = self.hass.config.path(self.destination)
+        if self.export_format == EXPORT_CSV:
+            await self.hass.async_add_executor_job(_append_csv, path, records)
+        else:
+            await self.hass.async_add_executor_job(
+                _append_line_protocol, path, records
+            )
+
+
+def encode_line_protocol(records: Iterable[ExportRecord]) -> bytes:
+    """Return records as InfluxDB line protocol, one point per asset."""
+    lines = []
+    for timestamp, snapshot in records:
+        fields = ",".join(
+            f"{key}={_field_value(value)}"
+            for key, value in zip(SNAPSHOT_KEYS, snapshot)
+            if value is not None
+        )
+        if fields:
+            lines.append(
+                f"{DOMAIN},asset={_escape_tag(snapshot.name)} {fields} "
+                f"{round(timestamp * 1_000_000_000)}\n"
+            )
+    return "".join(lines).encode()
+
+
+def _field_value(value: Any) -> str:
+    """Return a value as a line protocol field value."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        # Written as floats so a figure Ripple sends whole one time and
+        # fractional the next doesn't conflict with itself
+        return repr(float(value))
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _escape_tag(value: str) -> str:
+    """Return a value escaped for use as a line protocol tag value."""
+    for char in ("\\", ",", "=", " "):
+        value = value.replace(char, f"\\{char}")
+    return value
+
+
+def _append_line_protocol(path: str, records: list[ExportRecord]) -> None:
+    """Append records to a line protocol file."""
+    with open(path, "ab") as file:
+        file.write(encode_line_protocol(records))
+
+
+def _append_csv(path: str, records: list[ExportRecord]) -> None:
+    """Append records to a CSV file, rotating it once it is too big."""
+    if os.path.exists(path) and os.path.getsize(path) >= EXPORT_CSV_MAX_BYTES:
+        for index in range(EXPORT_CSV_BACKUPS - 1, 0, -1):
+            if os.path.exists(backup := f"{path}.{index}"):
+                os.replace(backup, f"{path}.{index + 1}")
+        os.replace(path, f"{path}.1")
+
+    new_file = not os.path.exists(path)
+    with open(path, "a", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        if new_file:
+            writer.writerow(CSV_HEADER)
+        writer.writerows(
+            (
+                dt_util.utc_from_timestamp(timestamp).isoformat(),
+                snapshot.name,
+                *snapshot,
+            )
+            for timestamp, snapshot in records
+        )
@@ -0,0 +1,161 @@
+"""Month and year projections for Ripple generation assets."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from itertools import repeat
+from math import fsum
+from operator import mul, sub
+
+from pyrippleapi.generation_asset import GenerationAsset
+
+from homeassistant.util import dt as dt_util
+
+from .const import RIPPLE_TIME_ZONE
+from .history import AssetHistory
+
+DAY = 24 * 3600
+# The month is projected from the last week's trend and the year from the
+# last month's, long enough to smooth out a windy day without lagging a
+# change of season by much
+MONTH_TREND_WINDOW = 7 * DAY
+YEAR_TREND_WINDOW = 30 * DAY
+MIN_TREND_SPAN = DAY
+FORECAST_KEYS = (
+    "forecast_month_generated",
+    "forecast_month_earned",
+    "forecast_year_generated",
+    "forecast_year_earned",
+    "expected_output",
+)
+# Generation is in kWh, expected annual generation is sent in larger units
+EXPECTED_GENERATION_SCALE = {"kWh": 1, "MWh": 1000, "GWh": 1000000}
+
+
+def trend_rate(
+    timestamps: array, values: array, since: float, min_span: float = MIN_TREND_SPAN
+) -> float | None:
+    """Return the least squares slope per second of values from since onwards.
+
+    None if the samples from since onwards span less than min_span.
+    """
+    start = bisect_left(timestamps, since)
+    if len(timestamps) - start < 2 or timestamps[-1] - timestamps[start] < min_span:
+        return None
+
+    # Offsetting time to the first sample keeps the squares well within
+    # float precision
+    x = array("d", map(sub, timestamps[start:], repeat(timestamps[start])))
+    y = values[start:]
+    count = len(x)
+    sum_x = fsum(x)
+    sum_y = fsum(y)
+    denominator = count * fsum(map(mul, x, x)) - sum_x * sum_x
+    if denominator <= 0:
+        return None
+    return (count * fsum(map(mul, x, y)) - sum_x * sum_y) / denominator
+
+
+class AssetForecast:
+    """End of month and year generation and earnings for one asset."""
+
+    def __init__(self) -> None:
+        """Initialise with nothing projected yet."""
+        self.forecast_month_generated: float | None = None
+        self.forecast_month_earned: float | None = None
+        self.forecast_year_generated: float | None = None
+        self.forecast_year_earned: float | None = None
+        self.expected_output: float | None = None
+        self._inputs: tuple | None = None
+
+    def update(
+        self, asset: GenerationAsset, history: AssetHistory | None, now: datetime
+    ) -> None:
+        """Project the month and year again if the figures behind them changed.
+
+        Projections stand as of the refresh that last changed them rather
+        than drifting with the clock in between.
+        """
+        generation = asset.generation_data
+        inputs = (
+            *(
+                generation.get(key)
+                for key in (
+                    "this_month_generated",
+                    "this_month_earned",
+                    "this_year_generated",
+                    "this_year_earned",
+                    "total_generated",
+                    "total_earned",
+                )
+            ),
+            asset.member_expected_annual_generation,
+            asset.member_expected_annual_generation_units,
+        )
+        if inputs == self._inputs:
+            return
+        self._inputs = inputs
+
+        # Ripple's months and years run on UK time
+        local = now.astimezone(dt_util.get_time_zone(RIPPLE_TIME_ZONE))
+        month_start = local.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        month_end = (month_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        year_start = month_start.replace(month=1)
+        year_end = year_start.replace(year=year_start.year + 1)
+
+        rates: dict[tuple[str, float], float | None] = {}
+        if history is not None:
+            timestamps = history.hourly["timestamp"] + history.raw["timestamp"]
+            for column in ("total_generated", "total_earned"):
+                values = history.hourly[column] + history.raw[column]
+                for window in (MONTH_TREND_WINDOW, YEAR_TREND_WINDOW):
+                    rates[column, window] = trend_rate(
+                        timestamps, values, now.timestamp() - window
+                    )
+
+        for period, start, end, window in (
+            ("month", month_start, month_end, MONTH_TREND_WINDOW),
+            ("year", year_start, year_end, YEAR_TREND_WINDOW),
+        ):
+            for figure in ("generated", "earned"):
+                setattr(
+                    self,
+                    f"forecast_{period}_{figure}",
+                    _project(
+                        generation.get(f"this_{period}_{figure}"),
+                        rates.get((f"total_{figure}", window)),
+                        start.timestamp(),
+                        end.timestamp(),
+                        now.timestamp(),
+                    ),
+                )
+
+        expected = asset.member_expected_annual_generation
+        scale = EXPECTED_GENERATION_SCALE.get(
+            asset.member_expected_annual_generation_units
+        )
+        if self.forecast_year_generated is None or not expected or scale is None:
+            self.expected_output = None
+        else:
+            self.expected_output = (
+                self.forecast_year_generated / (float(expected) * scale) * 100
+            )
+
+
+def _project(
+    so_far: float | None,
+    rate: float | None,
+    start: float,
+    end: float,
+    now: float,
+) -> float | None:
+    """Return a period's figure so far carried on to the end of the period."""
+    if so_far is None:
+        return None
+    if rate is None:
+        # Without enough local history carry on at the period's rate so far
+        if now <= start:
+            return None
+        rate = float(so_far) / (now - start)
+    return float(so_far) + max(rate, 0) * (end - now)
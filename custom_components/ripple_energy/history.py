@@ -0,0 +1,207 @@
+"""Local generation and earnings history for the Ripple energy integration."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator, Mapping
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import (
+    DOMAIN,
+    HISTORY_MAX_HOURLY_SAMPLES,
+    HISTORY_RAW_RETENTION,
+    HISTORY_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+if TYPE_CHECKING:
+    from .snapshot import AssetSnapshot
+
+HOUR = 3600
+COLUMNS = ("timestamp", "total_generated", "total_earned")
+STATISTICS = {
+    "total_generated": ("generated", UnitOfEnergy.KILO_WATT_HOUR),
+    "total_earned": ("earned", "GBP"),
+}
+
+
+def _columns() -> dict[str, array]:
+    """Return an empty set of sample columns."""
+    return {column: array("d") for column in COLUMNS}
+
+
+class AssetHistory:
+    """Array backed samples for one asset, recent ones raw and older ones hourly."""
+
+    def __init__(self) -> None:
+        """Initialise empty history."""
+        self.raw = _columns()
+        self.hourly = _columns()
+
+    def append(
+        self, timestamp: float, values: Mapping[str, Any] | AssetSnapshot
+    ) -> None:
+        """Append a polled sample and downsample whatever has aged out."""
+        if any(values.get(column) is None for column in COLUMNS[1:]):
+            return
+        self.raw["timestamp"].append(timestamp)
+        for column in COLUMNS[1:]:
+            self.raw[column].append(float(values.get(column)))
+        self._downsample(timestamp - HISTORY_RAW_RETENTION)
+
+    def _downsample(self, cutoff: float) -> None:
+        """Fold raw samples older than the cutoff into the hourly columns."""
+        raw_timestamps = self.raw["timestamp"]
+        hourly_timestamps = self.hourly["timestamp"]
+        aged = 0
+        while aged < len(raw_timestamps) and raw_timestamps[aged] < cutoff:
+            timestamp = raw_timestamps[aged]
+            # Keep the last sample seen in each hour
+            if hourly_timestamps and hourly_timestamps[-1] // HOUR == timestamp // HOUR:
+                for column in COLUMNS:
+                    self.hourly[column][-1] = self.raw[column][aged]
+            else:
+                for column in COLUMNS:
+                    self.hourly[column].append(self.raw[column][aged])
+            aged += 1
+
+        if not aged:
+            return
+        for column in COLUMNS:
+            del self.raw[column][:aged]
+        if (excess := len(hourly_timestamps) - HISTORY_MAX_HOURLY_SAMPLES) > 0:
+            for column in COLUMNS:
+                del self.hourly[column][:excess]
+
+    def samples(self, since: float = 0) -> Iterator[tuple[float, ...]]:
+        """Yield samples in time order from the given timestamp onwards."""
+        for tier in (self.hourly, self.raw):
+            for row in zip(*(tier[column] for column in COLUMNS)):
+                if row[0] >= since:
+                    yield row
+
+    def hourly_totals(self, since: float, until: float) -> list[tuple[float, ...]]:
+        """Return the last sample of each whole hour between since and until."""
+        totals: dict[float, tuple[float, ...]] = {}
+        for row in self.samples(since):
+            if (hour := row[0] // HOUR * HOUR) < until:
+                totals[hour] = (hour, *row[1:])
+        return list(totals.values())
+
+    def as_dict(self) -> dict[str, dict[str, list[float]]]:
+        """Return the history in a form that can be stored."""
+        return {
+            "raw": {column: values.tolist() for column, values in self.raw.items()},
+            "hourly": {
+                column: values.tolist() for column, values in self.hourly.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, dict[str, list[float]]]) -> AssetHistory:
+        """Restore history from its stored form."""
+        history = cls()
+        for tier in ("raw", "hourly"):
+            for column in COLUMNS:
+                getattr(history, tier)[column].extend(data[tier][column])
+        return history
+
+
+class RippleHistory:
+    """Keep the history of every asset on an account and feed it to statistics."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialise the account history."""
+        self.hass = hass
+        self.assets: dict[str, AssetHistory] = {}
+        self._imported: dict[str, float] = {}
+        self._unsaved = False
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.history"
+        )
+
+    async def async_load(self) -> None:
+        """Load stored history and backfill any hours statistics are missing."""
+        if (data := await self._store.async_load()) is None:
+            return
+        self.assets = {
+            name: AssetHistory.from_dict(history)
+            for name, history in data["assets"].items()
+        }
+        # Only hours after the last one imported are sent to statistics again,
+        # history saved before that was kept imports all of its hours
+        self._imported = data.get("imported", {})
+        imported = dict(self._imported)
+        self._async_import_statistics()
+        if self._imported != imported:
+            self._async_schedule_save()
+
+    async def async_flush(self) -> None:
+        """Write out history still waiting for its delayed save."""
+        if self._unsaved:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the stored history."""
+        await self._store.async_remove()
+
+    @callback
+    def async_record(self, snapshots: Mapping[str, AssetSnapshot]) -> None:
+        """Append a sample for every asset from the latest refresh."""
+        timestamp = dt_util.utcnow().timestamp()
+        for name, snapshot in snapshots.items():
+            self.assets.setdefault(name, AssetHistory()).append(timestamp, snapshot)
+        self._async_import_statistics()
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the history once it has had a while to build up."""
+        self._unsaved = True
+        self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+    @callback
+    def _async_import_statistics(self) -> None:
+        """Import every whole hour not yet sent to long term statistics."""
+        current_hour = dt_util.utcnow().timestamp() // HOUR * HOUR
+        for name, history in self.assets.items():
+            since = self._imported.get(name, 0)
+            if not (totals := history.hourly_totals(since, current_hour)):
+                continue
+            for column, (suffix, unit) in STATISTICS.items():
+                index = COLUMNS.index(column)
+                metadata = StatisticMetaData(
+                    has_mean=False,
+                    has_sum=True,
+                    name=f"{name} {suffix}",
+                    source=DOMAIN,
+                    statistic_id=f"{DOMAIN}:{slugify(name)}_{column}",
+                    unit_of_measurement=unit,
+                )
+                statistics = [
+                    StatisticData(
+                        start=datetime.fromtimestamp(row[0], dt_util.UTC),
+                        state=row[index],
+                        sum=row[index],
+                    )
+                    for row in totals
+                ]
+                async_add_external_statistics(self.hass, metadata, statistics)
+            self._imported[name] = totals[-1][0] + HOUR
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the history of every asset to store."""
+        self._unsaved = False
+        return {
+            "assets": {name: history.as_dict() for name, history in self.assets.items()},
+            "imported": dict(self._imported),
+        }
@@ -0,0 +1,93 @@
+"""Refresh metrics for the Ripple energy integration."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any
+
+# Upper bounds in seconds of the request latency histogram buckets, anything
+# slower lands in a final overflow bucket
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class RippleMetrics:
+    """Metrics for a coordinator, updated in place as each refresh runs."""
+
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_success: datetime | None = None
+    last_failure: datetime | None = None
+    last_error: str | None = None
+    last_request_latency: float | None = None
+    request_latency_total: float = 0.0
+    request_latency_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    unchanged_responses: int = 0
+    payload_bytes: int = 0
+    last_decode_time: float | None = None
+    decode_time_total: float = 0.0
+    payload_assets: int = 0
+    last_parse_time: float | None = None
+    parse_time_total: float = 0.0
+    asset_parse_time: dict[str, float] = field(default_factory=dict)
+    last_entities_notified: int = 0
+    entities_notified_total: int = 0
+
+    def record_request(self, latency: float) -> None:
+        """Record how long a request to Ripple took, successful or not."""
+        self.requests += 1
+        self.last_request_latency = latency
+        self.request_latency_total += latency
+        self.request_latency_buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def record_unchanged(self, now: datetime) -> None:
+        """Record a successful request whose payload had not changed."""
+        self.unchanged_responses += 1
+        self.record_success(now)
+
+    def record_decode(self, payload_bytes: int, decode_time: float) -> None:
+        """Record the size of a new payload and how long decoding it took."""
+        self.payload_bytes = payload_bytes
+        self.last_decode_time = decode_time
+        self.decode_time_total += decode_time
+
+    def record_parse(
+        self, parse_time: float, payload_assets: int, asset_parse_time: dict[str, float]
+    ) -> None:
+        """Record how long applying a payload to the assets took."""
+        self.last_parse_time = parse_time
+        self.parse_time_total += parse_time
+        self.payload_assets = payload_assets
+        self.asset_parse_time = asset_parse_time
+
+    def record_success(self, now: datetime) -> None:
+        """Record a successful refresh."""
+        self.consecutive_failures = 0
+        self.last_success = now
+
+    def record_failure(self, now: datetime, err: Exception) -> None:
+        """Record a failed refresh."""
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_failure = now
+        self.last_error = repr(err)
+
+    def record_notified(self, entities: int) -> None:
+        """Record how many entities a refresh notified."""
+        self.last_entities_notified = entities
+        self.entities_notified_total += entities
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        metrics = asdict(self)
+        metrics["request_latency_buckets"] = dict(
+            zip(
+                [*(f"le_{bound}" for bound in LATENCY_BUCKETS), "inf"],
+                self.request_latency_buckets,
+            )
+        )
+        return metrics
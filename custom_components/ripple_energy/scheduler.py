@@ -0,0 +1,82 @@
+"""Adaptive polling scheduler for the Ripple energy integration."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import random
+
+from .const import POLL_JITTER
+
+# Weight given to the newest gap between publications when learning the period
+PERIOD_SMOOTHING = 0.3
+# How long after the expected publication to poll, Ripple is rarely on the dot
+PUBLICATION_MARGIN = timedelta(seconds=60)
+MAX_BACKOFF_EXPONENT = 16
+
+
+class RipplePollScheduler:
+    """Work out when to poll next from when Ripple publishes new figures."""
+
+    def __init__(self, min_interval: float, max_interval: float) -> None:
+        """Initialise the scheduler with the configured interval bounds."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.period: float | None = None
+        self.last_published: datetime | None = None
+        self.failures = 0
+        self._misses = 0
+
+    def set_bounds(self, min_interval: float, max_interval: float) -> None:
+        """Update the configured interval bounds."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+    def record_update(self, published: datetime | None) -> None:
+        """Record a successful poll and when its figures were published."""
+        self.failures = 0
+        if published is None or (
+            self.last_published is not None and published <= self.last_published
+        ):
+            self._misses += 1
+            return
+
+        if self.last_published is not None:
+            gap = (published - self.last_published).total_seconds()
+            if self.period is None:
+                self.period = gap
+            else:
+                self.period += PERIOD_SMOOTHING * (gap - self.period)
+        self.last_published = published
+        self._misses = 0
+
+    def record_failure(self) -> None:
+        """Record a poll that failed to reach Ripple."""
+        self.failures += 1
+
+    def next_interval(self, now: datetime) -> timedelta:
+        """Return how long to wait before the next poll."""
+        # Polls are spread out so config entries set up together don't stay
+        # in step, bringing them forward unless they are meant to follow a
+        # publication, where early would be before the figures are out
+        jitter = random.uniform(0, POLL_JITTER)
+        if self.failures:
+            seconds = self.min_interval * 2 ** min(
+                self.failures - 1, MAX_BACKOFF_EXPONENT
+            )
+            seconds *= 1 - jitter
+        elif self.period is None or self.last_published is None:
+            seconds = self.max_interval * (1 - jitter)
+        else:
+            expected = self.last_published + timedelta(seconds=self.period)
+            seconds = (expected + PUBLICATION_MARGIN - now).total_seconds()
+            if seconds > 0:
+                seconds += jitter * PUBLICATION_MARGIN.total_seconds()
+            else:
+                # The publication is late, keep checking but back off each
+                # time nothing new turns up
+                seconds = self.min_interval * 2 ** min(
+                    self._misses, MAX_BACKOFF_EXPONENT
+                )
+                seconds *= 1 - jitter
+
+        lower = min(self.min_interval, self.max_interval)
+        return timedelta(seconds=min(max(seconds, lower), self.max_interval))
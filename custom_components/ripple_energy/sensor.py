@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
+from datetime import datetime
+
+from pyrippleapi.generation_asset import GenerationAsset
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -18,14 +22,25 @@ from homeassistant.const import (
     UnitOfTemperature,
     REVOLUTIONS_PER_MINUTE,
     DEGREE,
+    PERCENTAGE,
+    EntityCategory,
+    Platform,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_NEW_ASSETS
 from .coordinator import RippleCoordinator
-from .entity import RippleBaseEntity
+from .entity import (
+    RippleAccountEntity,
+    RippleBaseEntity,
+    async_account_entity_enabled,
+    async_asset_entity_enabled,
+)
+from .metrics import RippleMetrics
 
 
 @dataclass(kw_only=True)
@@ -33,6 +48,13 @@ class RippleSensorEntityDescription(SensorEntityDescription):
     """Represent the Ripple sensor entity description."""
 
 
+@dataclass(kw_only=True)
+class RippleMetricSensorEntityDescription(SensorEntityDescription):
+    """Represent the Ripple refresh metric sensor entity description."""
+
+    value_fn: Callable[[RippleMetrics], StateType | datetime]
+
+
 MEMBER_SENSORS: tuple[RippleSensorEntityDescription, ...] = (
     RippleSensorEntityDescription(
         key="member_capacity",
@@ -101,6 +123,84 @@ TELEMETRY_SENSORS: tuple[RippleSensorEntityDescription, ...] = (
     ),
 )
 
+DERIVED_SENSORS: tuple[RippleSensorEntityDescription, ...] = (
+    RippleSensorEntityDescription(
+        key="capacity_factor",
+        translation_key="capacity_factor",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        icon="mdi:gauge",
+    ),
+    RippleSensorEntityDescription(
+        key="wind_speed_24h",
+        translation_key="wind_speed_24h",
+        native_unit_of_measurement=UnitOfSpeed.MILES_PER_HOUR,
+        device_class=SensorDeviceClass.WIND_SPEED,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        icon="mdi:weather-windy",
+    ),
+    RippleSensorEntityDescription(
+        key="wind_speed_7d",
+        translation_key="wind_speed_7d",
+        native_unit_of_measurement=UnitOfSpeed.MILES_PER_HOUR,
+        device_class=SensorDeviceClass.WIND_SPEED,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        icon="mdi:weather-windy",
+    ),
+    RippleSensorEntityDescription(
+        key="uptime",
+        translation_key="uptime",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        icon="mdi:wind-turbine-check",
+    ),
+)
+
+FORECAST_SENSORS: tuple[RippleSensorEntityDescription, ...] = (
+    RippleSensorEntityDescription(
+        key="forecast_month_generated",
+        translation_key="forecast_month_generated",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        suggested_display_precision=1,
+        icon="mdi:chart-line",
+    ),
+    RippleSensorEntityDescription(
+        key="forecast_month_earned",
+        translation_key="forecast_month_earned",
+        native_unit_of_measurement="GBP",
+        suggested_display_precision=2,
+        icon="mdi:currency-gbp",
+    ),
+    RippleSensorEntityDescription(
+        key="forecast_year_generated",
+        translation_key="forecast_year_generated",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        suggested_display_precision=1,
+        icon="mdi:chart-line",
+    ),
+    RippleSensorEntityDescription(
+        key="forecast_year_earned",
+        translation_key="forecast_year_earned",
+        native_unit_of_measurement="GBP",
+        suggested_display_precision=2,
+        icon="mdi:currency-gbp",
+    ),
+    RippleSensorEntityDescription(
+        key="expected_output",
+        translation_key="expected_output",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        icon="mdi:target",
+    ),
+)
+
 SENSORS: tuple[RippleSensorEntityDescription, ...] = (
     RippleSensorEntityDescription(
         key="latest_generated",
@@ -260,6 +360,58 @@ SENSORS: tuple[RippleSensorEntityDescription, ...] = (
 )
 
 
+METRIC_SENSORS: tuple[RippleMetricSensorEntityDescription, ...] = (
+    RippleMetricSensorEntityDescription(
+        key="last_request_latency",
+        translation_key="request_latency",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.last_request_latency,
+    ),
+    RippleMetricSensorEntityDescription(
+        key="last_parse_time",
+        translation_key="parse_time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: (
+            None if metrics.last_parse_time is None else metrics.last_parse_time * 1000
+        ),
+    ),
+    RippleMetricSensorEntityDescription(
+        key="consecutive_failures",
+        translation_key="consecutive_failures",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.consecutive_failures,
+    ),
+    RippleMetricSensorEntityDescription(
+        key="last_success",
+        translation_key="last_success",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.last_success,
+    ),
+    RippleMetricSensorEntityDescription(
+        key="last_entities_notified",
+        translation_key="entities_notified",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.last_entities_notified,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -267,23 +419,68 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Ripple sensors from config entry."""
 
-    coordinators: list[RippleCoordinator] = list(
-        hass.data[DOMAIN][config_entry.entry_id].values()
-    )
+    coordinator: RippleCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    @callback
+    def enabled(
+        asset: GenerationAsset, description: RippleSensorEntityDescription
+    ) -> bool:
+        """Return False if the sensor is disabled in the entity registry."""
+        return async_asset_entity_enabled(hass, Platform.SENSOR, asset, description)
+
+    @callback
+    def _async_add_assets(assets: Iterable[GenerationAsset]) -> None:
+        """Add sensors for generation assets."""
+        sensors = []
 
-    sensors = []
+        for asset in assets:
+            snapshot = coordinator.snapshots[asset.name]
+            for sensor in SENSORS:
+                if sensor.key in snapshot and enabled(asset, sensor):
+                    sensors.append(RippleSensor(coordinator, asset, sensor))
+            for sensor in MEMBER_SENSORS:
+                if enabled(asset, sensor):
+                    sensors.append(RippleMemberSensor(coordinator, asset, sensor))
+            for sensor in TELEMETRY_SENSORS:
+                if sensor.key in snapshot and enabled(asset, sensor):
+                    sensors.append(RippleTelemetrySensor(coordinator, asset, sensor))
+            for sensor in DERIVED_SENSORS:
+                if enabled(asset, sensor):
+                    sensors.append(RippleDerivedSensor(coordinator, asset, sensor))
+            for sensor in FORECAST_SENSORS:
+                if enabled(asset, sensor):
+                    sensors.append(RippleForecastSensor(coordinator, asset, sensor))
+
+        async_add_entities(sensors)
+
+    _async_add_assets(coordinator.assets.values())
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_ASSETS.format(config_entry.entry_id), _async_add_assets
+        )
+    )
 
-    for coordinator in coordinators:
-        for sensor in SENSORS:
-            if sensor.key in coordinator.asset.generation_data:
-                sensors.append(RippleSensor(coordinator, sensor))
-        for sensor in MEMBER_SENSORS:
-            sensors.append(RippleMemberSensor(coordinator, sensor))
-        for sensor in TELEMETRY_SENSORS:
-            if sensor.key in coordinator.asset.latest_telemetry:
-                sensors.append(RippleTelemetrySensor(coordinator, sensor))
+    @callback
+    def account_enabled(description: SensorEntityDescription) -> bool:
+        """Return False if the account sensor is disabled in the entity registry."""
+        return async_account_entity_enabled(
+            hass, Platform.SENSOR, config_entry, description
+        )
 
-    async_add_entities(sensors)
+    async_add_entities(
+        [
+            *(
+                RippleTotalSensor(coordinator, sensor)
+                for sensor in (*MEMBER_SENSORS, *SENSORS)
+                if sensor.key in coordinator.totals and account_enabled(sensor)
+            ),
+            *(
+                RippleMetricSensor(coordinator, sensor)
+                for sensor in METRIC_SENSORS
+                if account_enabled(sensor)
+            ),
+        ]
+    )
 
 
 class RippleSensor(RippleBaseEntity, SensorEntity):
@@ -292,47 +489,86 @@ class RippleSensor(RippleBaseEntity, SensorEntity):
     def __init__(
         self,
         coordinator: RippleCoordinator,
+        asset: GenerationAsset,
         sensor_description: RippleSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self.entity_description: RippleSensorEntityDescription = sensor_description
-        self._attr_unique_id = (
-            f"{self.asset.name}-{self.entity_description.translation_key}"
-        )
+        super().__init__(coordinator, asset, sensor_description)
+        self.entity_description: RippleSensorEntityDescription
 
     @property
     def native_value(self) -> StateType:
         """Return sensor value."""
 
-        return self.asset.generation_data[self.entity_description.key]
+        if (snapshot := self.snapshot) is None:
+            return None
+        return snapshot[self._value_index]
 
 
 class RippleMemberSensor(RippleSensor):
     def __init__(
         self,
         coordinator: RippleCoordinator,
+        asset: GenerationAsset,
         sensor_description: RippleSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator, sensor_description)
-
-    @property
-    def native_value(self) -> StateType:
-        """Return sensor value."""
-        return getattr(self.asset, self.entity_description.key)
+        super().__init__(coordinator, asset, sensor_description)
 
 
 class RippleTelemetrySensor(RippleSensor):
     def __init__(
         self,
         coordinator: RippleCoordinator,
+        asset: GenerationAsset,
         sensor_description: RippleSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator, sensor_description)
+        super().__init__(coordinator, asset, sensor_description)
+
+
+class RippleDerivedSensor(RippleSensor):
+    """Representation of a value the integration derives for a Ripple asset."""
+
+
+class RippleForecastSensor(RippleSensor):
+    """Representation of a month or year projection for a Ripple asset."""
+
+
+class RippleTotalSensor(RippleAccountEntity, SensorEntity):
+    """Representation of a Ripple value summed across every asset on the account."""
+
+    entity_description: RippleSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: RippleCoordinator,
+        sensor_description: RippleSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator,
+            sensor_description,
+            context=(coordinator.config_entry.entry_id, sensor_description.key),
+        )
 
     @property
     def native_value(self) -> StateType:
         """Return sensor value."""
-        return self.asset.latest_telemetry[self.entity_description.key]
+        return self.coordinator.totals.get(self.entity_description.key)
+
+
+class RippleMetricSensor(RippleAccountEntity, SensorEntity):
+    """Representation of a Ripple refresh metric sensor."""
+
+    entity_description: RippleMetricSensorEntityDescription
+
+    @property
+    def available(self) -> bool:
+        """Return True as metrics are reported whether or not refreshes succeed."""
+        return True
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return sensor value."""
+        return self.entity_description.value_fn(self.coordinator.metrics)
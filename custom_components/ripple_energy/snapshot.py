@@ -0,0 +1,121 @@
+"""Read-only values of each Ripple generation asset as of the last refresh."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Any
+
+from pyrippleapi.generation_asset import GenerationAsset
+
+from .derived import DERIVED_KEYS, AssetDerivedValues
+from .forecast import FORECAST_KEYS, AssetForecast
+
+MEMBER_KEYS = ("status", "member_capacity", "member_expected_annual_generation")
+ROLLUP_KEYS = (
+    "latest_generated",
+    "latest_earned",
+    *(
+        f"{time_scale}_{figure}"
+        for time_scale in (
+            "today",
+            "yesterday",
+            "this_week",
+            "last_week",
+            "this_month",
+            "last_month",
+            "this_year",
+            "last_year",
+            "total",
+        )
+        for figure in ("generated", "earned")
+    ),
+)
+TELEMETRY_KEYS = (
+    "wind_speed_avg",
+    "generator_speed_avg",
+    "blade_angle_avg",
+    "nacelle_position",
+    "tower_base_temp_avg",
+    "ambient_temp_max",
+)
+SNAPSHOT_KEYS = (
+    *MEMBER_KEYS,
+    *ROLLUP_KEYS,
+    *TELEMETRY_KEYS,
+    *DERIVED_KEYS,
+    *FORECAST_KEYS,
+)
+# Shared by every snapshot, entities look their index up once when created
+KEY_INDEX = {key: index for index, key in enumerate(SNAPSHOT_KEYS)}
+
+# Marks a value Ripple didn't send, as opposed to one it sent as null
+_MISSING: Any = object()
+
+
+class AssetSnapshot:
+    """Immutable values of one asset, in the order of the shared key table."""
+
+    __slots__ = ("name", "recorded", "_values")
+
+    name: str
+    recorded: datetime | None
+    _values: tuple[Any, ...]
+
+    def __init__(
+        self, name: str, recorded: datetime | None, values: tuple[Any, ...]
+    ) -> None:
+        """Initialise a snapshot from values ordered as SNAPSHOT_KEYS."""
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "recorded", recorded)
+        object.__setattr__(self, "_values", values)
+
+    @classmethod
+    def from_asset(
+        cls,
+        asset: GenerationAsset,
+        derived: AssetDerivedValues,
+        forecast: AssetForecast,
+        recorded: datetime | None,
+    ) -> AssetSnapshot:
+        """Capture an asset's values once a refresh has been applied to it."""
+        generation = asset.generation_data
+        telemetry = asset.latest_telemetry
+        return cls(
+            asset.name,
+            recorded,
+            (
+                *(getattr(asset, key) for key in MEMBER_KEYS),
+                *(generation.get(key, _MISSING) for key in ROLLUP_KEYS),
+                *(telemetry.get(key, _MISSING) for key in TELEMETRY_KEYS),
+                *(getattr(derived, key) for key in DERIVED_KEYS),
+                *(getattr(forecast, key) for key in FORECAST_KEYS),
+            ),
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Refuse to change a snapshot."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        """Refuse to change a snapshot."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getitem__(self, index: int) -> Any:
+        """Return the value at an index of the key table, None if not sent."""
+        if (value := self._values[index]) is _MISSING:
+            return None
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        """Return every value in key table order, None where not sent."""
+        return (None if value is _MISSING else value for value in self._values)
+
+    def __contains__(self, key: str) -> bool:
+        """Return whether Ripple sent a value for a key."""
+        if (index := KEY_INDEX.get(key)) is None:
+            return False
+        return self._values[index] is not _MISSING
+
+    def get(self, key: str) -> Any:
+        """Return the value of a key, None if not sent."""
+        return self[KEY_INDEX[key]]
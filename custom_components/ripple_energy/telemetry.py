@@ -0,0 +1,96 @@
+"""In-memory buffer of recent telemetry for the Ripple energy integration."""
+from __future__ import annotations
+
+from array import array
+from datetime import datetime
+import math
+
+from pyrippleapi.generation_asset import GenerationAsset
+
+from .const import TELEMETRY_BUFFER_SIZE
+
+TELEMETRY_COLUMNS = (
+    "wind_speed_avg",
+    "generator_speed_avg",
+    "blade_angle_avg",
+    "nacelle_position",
+    "tower_base_temp_avg",
+    "ambient_temp_max",
+    "latest_generated",
+)
+
+
+class TelemetryRingBuffer:
+    """Fixed size columns of recent samples, the oldest overwritten first."""
+
+    def __init__(self, capacity: int = TELEMETRY_BUFFER_SIZE) -> None:
+        """Initialise an empty buffer."""
+        self.capacity = capacity
+        self._timestamps = array("d")
+        self._columns = {column: array("d") for column in TELEMETRY_COLUMNS}
+        # Index of the oldest sample once the buffer has filled and wrapped
+        self._start = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return len(self._timestamps)
+
+    @property
+    def last_timestamp(self) -> float | None:
+        """Return the timestamp of the newest sample."""
+        if not self._timestamps:
+            return None
+        return self._timestamps[self._start - 1]
+
+    def append(
+        self, asset: GenerationAsset, now: datetime, recorded: datetime | None
+    ) -> None:
+        """Add the asset's latest values unless they have already been added."""
+        timestamp = (recorded or now).timestamp()
+        if (last := self.last_timestamp) is not None and timestamp <= last:
+            return
+
+        values = [
+            asset.latest_telemetry.get(
+                column, asset.generation_data.get(column, math.nan)
+            )
+            for column in TELEMETRY_COLUMNS
+        ]
+        if len(self._timestamps) < self.capacity:
+            self._timestamps.append(timestamp)
+            for column, value in zip(TELEMETRY_COLUMNS, values):
+                self._columns[column].append(_to_float(value))
+            return
+
+        index = self._start
+        self._timestamps[index] = timestamp
+        for column, value in zip(TELEMETRY_COLUMNS, values):
+            self._columns[column][index] = _to_float(value)
+        self._start = (index + 1) % self.capacity
+
+    def as_columns(
+        self, since: float | None = None, columns: tuple[str, ...] = TELEMETRY_COLUMNS
+    ) -> dict[str, list[float | None]]:
+        """Return samples from oldest to newest as one list per column."""
+        order = [*range(self._start, len(self)), *range(self._start)]
+        if since is not None:
+            order = [index for index in order if self._timestamps[index] >= since]
+
+        result: dict[str, list[float | None]] = {
+            "timestamp": [self._timestamps[index] for index in order]
+        }
+        for column in columns:
+            values = self._columns[column]
+            result[column] = [
+                None if math.isnan(value := values[index]) else value
+                for index in order
+            ]
+        return result
+
+
+def _to_float(value: object) -> float:
+    """Return a sample value as a float, NaN when it is missing."""
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return math.nan
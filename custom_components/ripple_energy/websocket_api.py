@@ -0,0 +1,56 @@
+"""Websocket API for the Ripple energy integration."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import RippleCoordinator
+from .telemetry import TELEMETRY_COLUMNS
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Set up the Ripple energy websocket API."""
+    websocket_api.async_register_command(hass, ws_history)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/history",
+        vol.Required("entry_id"): str,
+        vol.Optional("assets"): [str],
+        vol.Optional("since"): vol.Coerce(float),
+        vol.Optional("columns", default=list(TELEMETRY_COLUMNS)): [
+            vol.In(TELEMETRY_COLUMNS)
+        ],
+    }
+)
+@callback
+def ws_history(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return recent telemetry held in memory as columns per asset."""
+    coordinator: RippleCoordinator | None = hass.data.get(DOMAIN, {}).get(
+        msg["entry_id"]
+    )
+    if coordinator is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not loaded"
+        )
+        return
+
+    names = msg.get("assets", coordinator.telemetry)
+    columns = tuple(msg["columns"])
+    connection.send_result(
+        msg["id"],
+        {
+            name: coordinator.telemetry[name].as_columns(msg.get("since"), columns)
+            for name in names
+            if name in coordinator.telemetry
+        },
+    )